@@ -8,10 +8,40 @@ app = Celery('corporate_management')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
+# Veritabanı bağlantıları: Celery'nin Django entegrasyonu her task öncesi ve
+# sonrası close_if_unusable_or_obsolete çağırır; böylece DATABASES'taki
+# CONN_MAX_AGE / CONN_HEALTH_CHECKS worker'larda da geçerlidir ve sağlam
+# bağlantılar task'lar arasında yeniden kullanılır.
+# pgbouncer transaction pooling'de (DATABASE_POOL_MODE=transaction) ardışık
+# transaction'lar farklı sunucu bağlantılarına düşer: task'lar oturum düzeyinde
+# SET kullanmamalı, audit bilgisi SET LOCAL ile verilir ve veritabanının
+# varsayılan timezone'u UTC olduğundan Django bağlantı başına SET TIME ZONE
+# çalıştırmaz (bkz. settings.DATABASE_POOL_MODE).
+
 # Celery Beat Schedule
 app.conf.beat_schedule = {
     'generate-daily-reports': {
         'task': 'core.tasks.generate_scheduled_reports',
         'schedule': crontab(hour=0, minute=0),  # Her gün gece yarısı
     },
+    'update-contract-statuses': {
+        'task': 'core.tasks.update_contract_statuses',
+        'schedule': crontab(hour=0, minute=5),
+    },
+    'update-promissory-note-statuses': {
+        'task': 'core.tasks.update_promissory_note_statuses',
+        'schedule': crontab(hour=0, minute=5),
+    },
+    'generate-monthly-financial-summary': {
+        'task': 'core.tasks.generate_monthly_financial_summary',
+        'schedule': crontab(day_of_month=1, hour=1, minute=0),  # Her ayın 1'i
+    },
+    'backup-database': {
+        'task': 'core.tasks.backup_database',
+        'schedule': crontab(day_of_week='sunday', hour=2, minute=0),  # Haftada bir
+    },
+    'cleanup-orphaned-media': {
+        'task': 'core.tasks.cleanup_orphaned_media',
+        'schedule': crontab(day_of_week='sunday', hour=3, minute=0),  # Haftada bir
+    },
 }
\ No newline at end of file
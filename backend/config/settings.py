@@ -1,7 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import config, Csv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -38,6 +39,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'core.middleware.AuditContextMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -60,6 +63,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Bağlantı havuzu modu:
+# 'session': Django bağlantıları CONN_MAX_AGE süresince kendisi tutar (doğrudan PostgreSQL)
+# 'transaction': pgbouncer transaction pooling arkasında çalışma; server-side
+#   cursor'lar kapatılır ve oturum ayarları transaction'a yerel tutulur.
+#   Oturum düzeyinde durum bırakılmamalıdır:
+#   - audit bilgisi yalnızca SET LOCAL ile ayarlanır (core.middleware, core.audit)
+#   - veritabanının varsayılan timezone'u UTC olmalıdır (docker-compose db servisi veya
+#     ALTER DATABASE ... SET timezone TO 'UTC'); aksi halde Django (USE_TZ=True)
+#     her yeni bağlantıda SET TIME ZONE 'UTC' çalıştırır
+DATABASE_POOL_MODE = config('DATABASE_POOL_MODE', default='session')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -68,9 +82,34 @@ DATABASES = {
         'PASSWORD': config('DATABASE_PASSWORD', default='corporate_pass'),
         'HOST': config('DATABASE_HOST', default='localhost'),
         'PORT': config('DATABASE_PORT', default='5432'),
+        # Kalıcı bağlantılar: istek ve Celery task'ları arasında yeniden kullanılır,
+        # yeniden kullanılmadan önce sağlık kontrolünden geçer
+        'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DATABASE_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'DISABLE_SERVER_SIDE_CURSORS': DATABASE_POOL_MODE == 'transaction',
+        'OPTIONS': {
+            'connect_timeout': config('DATABASE_CONNECT_TIMEOUT', default=5, cast=int),
+        },
     }
 }
 
+# Okuma replikaları: virgülle ayrılmış host[:port] listesi (ör. "db-replica-1,db-replica-2:5433").
+# Her biri birincil veritabanının ayarlarıyla replica_<n> olarak tanımlanır; güvenli
+# istekler ve use_replica=True task'ları bu bağlantılardan okur (bkz. core/db_router.py).
+for index, replica_host in enumerate(config('DATABASE_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    replica_host, _, replica_port = replica_host.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_READ_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+# Yazma sonrası kullanıcının okumalarının birincil veritabanında kalacağı süre (saniye)
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=5, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -99,6 +138,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson tabanlı JSON (bkz. core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_FILTER_BACKENDS': [
@@ -106,13 +155,20 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # Sayaçlar Redis'te atomik tutulur (bkz. core/throttling.py)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'core.throttling.RedisAnonRateThrottle',
+        'core.throttling.RedisUserRateThrottle',
+        'core.throttling.RedisScopedRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        # Ağır işlemler (action'daki throttle_scope ile)
+        'export': '30/hour',
+        'report_generate': '30/hour',
+        'document_generate': '60/hour',
+        'bulk_delete': '30/hour',
     }
 }
 
@@ -135,6 +191,47 @@ CORS_ALLOWED_ORIGINS = config(
 ).split(',')
 CORS_ALLOW_CREDENTIALS = True
 
+# Önbellek: Celery'den ayrı bir Redis veritabanı; tüm gunicorn worker'ları ve
+# sunucular aynı önbelleği (rapor kilitleri, istek sınırları vb.) paylaşır.
+# Anahtarlar CACHE_KEY_PREFIX ile ad alanına alınır; CACHE_VERSION artırılarak
+# tüm önbellek geçersiz kılınabilir. CACHE_REDIS_URL boşsa süreç içi önbellek kullanılır.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default='corporate')
+# Redis bağlantı/okuma zaman aşımı (sn): takılan bir Redis istekleri bekletmesin
+CACHE_REDIS_SOCKET_TIMEOUT = config('CACHE_REDIS_SOCKET_TIMEOUT', default=2, cast=float)
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'VERSION': config('CACHE_VERSION', default=1, cast=int),
+            'OPTIONS': {
+                'socket_connect_timeout': CACHE_REDIS_SOCKET_TIMEOUT,
+                'socket_timeout': CACHE_REDIS_SOCKET_TIMEOUT,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+        }
+    }
+
+# Yanıt sıkıştırma (brotli tercihli, yoksa gzip; bkz. core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_LENGTH = config('COMPRESSION_MIN_LENGTH', default=512, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+
+# Liste yanıtı önbelleği (CachedListMixin kullanan ViewSet'ler, bkz. core/list_cache.py)
+# Nesil sayaçları tüm worker'lar ve Celery arasında paylaşılmalı: süreç içi
+# önbellekte bir süreçteki yazma diğerlerinin listelerini geçersiz kılmaz.
+# Bu yüzden yalnızca CACHE_REDIS_URL tanımlıysa varsayılan olarak açıktır.
+LIST_CACHE_ENABLED = config('LIST_CACHE_ENABLED', default=bool(CACHE_REDIS_URL), cast=bool)
+LIST_CACHE_TIMEOUT = config('LIST_CACHE_TIMEOUT', default=600, cast=int)
+
 # Celery
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -143,6 +240,84 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Task ilerleme akışı (SSE, bkz. core/progress.py)
+# Sync gunicorn worker'larında 0: her istek anlık durumu gönderip kapanır, EventSource
+# TASK_EVENTS_RETRY_MS sonra yeniden bağlanır. Uzun akış yalnızca gevent worker'lı servis için.
+TASK_EVENTS_STREAM_TIMEOUT = config('TASK_EVENTS_STREAM_TIMEOUT', default=0, cast=int)
+TASK_EVENTS_RETRY_MS = config('TASK_EVENTS_RETRY_MS', default=2000, cast=int)
+# events endpoint'inin ?token= geçerlilik süresi ve task izin kaydının ömrü (sn)
+TASK_EVENTS_TOKEN_MAX_AGE = config('TASK_EVENTS_TOKEN_MAX_AGE', default=600, cast=int)
+TASK_ACCESS_TIMEOUT = config('TASK_ACCESS_TIMEOUT', default=86400, cast=int)
+
+# Zamanlanmış raporlar
+REPORT_SYSTEM_USERNAME = config('REPORT_SYSTEM_USERNAME', default='system')
+REPORT_FANOUT_BATCH_SIZE = config('REPORT_FANOUT_BATCH_SIZE', default=50, cast=int)
+REPORT_FANOUT_BATCH_INTERVAL = config('REPORT_FANOUT_BATCH_INTERVAL', default=30, cast=int)
+# Çalıştırma özeti: sonuçların kontrol aralığı (sn) ve grup başına beklemeye
+# eklenen pay (sn); süre dolarsa kısmi özet loglanır
+REPORT_SUMMARY_POLL_INTERVAL = config('REPORT_SUMMARY_POLL_INTERVAL', default=60, cast=int)
+REPORT_SUMMARY_MARGIN = config('REPORT_SUMMARY_MARGIN', default=3600, cast=int)
+
+# Zamanlanmış durum geçişlerinde (sözleşme/senet) transaction başına kayıt sayısı
+LIFECYCLE_BATCH_SIZE = config('LIFECYCLE_BATCH_SIZE', default=1000, cast=int)
+
+# Toplu sözleşme belgesi üretiminde task içinde kullanılacak thread sayısı
+CONTRACT_BATCH_WORKERS = config('CONTRACT_BATCH_WORKERS', default=4, cast=int)
+
+# DOCX -> PDF dönüştürücü havuzu (worker process başına sıcak unoserver/soffice süreçleri)
+# LibreOffice yalnızca celery imajında kurulu olduğundan varsayılan kapalıdır;
+# docker-compose celery servisinde açılır. Kapalıyken sözleşmeler DOCX üretilir.
+PDF_CONVERTER_ENABLED = config('PDF_CONVERTER_ENABLED', default=False, cast=bool)
+PDF_CONVERTER_POOL_SIZE = config('PDF_CONVERTER_POOL_SIZE', default=1, cast=int)
+PDF_CONVERTER_TIMEOUT = config('PDF_CONVERTER_TIMEOUT', default=60, cast=int)
+PDF_CONVERTER_STARTUP_TIMEOUT = config('PDF_CONVERTER_STARTUP_TIMEOUT', default=30, cast=int)
+PDF_CONVERTER_MAX_JOBS = config('PDF_CONVERTER_MAX_JOBS', default=200, cast=int)
+PDF_CONVERTER_PYTHON = config('PDF_CONVERTER_PYTHON', default='/usr/bin/python3')
+PDF_CONVERTER_PYTHONPATH = config('PDF_CONVERTER_PYTHONPATH', default='/opt/unoserver')
+
+# HTML/CSS PDF raporları: istek içinde üretilecek en fazla satır (üstü Celery'de)
+# ve bir PDF export'unun içerebileceği en fazla satır
+PDF_REPORT_SYNC_MAX_ROWS = config('PDF_REPORT_SYNC_MAX_ROWS', default=500, cast=int)
+PDF_REPORT_MAX_ROWS = config('PDF_REPORT_MAX_ROWS', default=20000, cast=int)
+
+# E-posta (yerelde docker-compose'daki mailpit SMTP sunucusu kullanılır)
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@localhost')
+
+# Bildirim özetlerinde şirket başına listelenen kayıt sayısı
+NOTIFICATION_DIGEST_TOP_N = config('NOTIFICATION_DIGEST_TOP_N', default=10, cast=int)
+# Tek SMTP bağlantısı üzerinden gönderilecek en fazla mesaj
+NOTIFICATION_EMAIL_BATCH_SIZE = config('NOTIFICATION_EMAIL_BATCH_SIZE', default=100, cast=int)
+
+# Dosya temizliği: sayfa başına satır sayısı ve paralel silme thread sayısı
+FILE_CLEANUP_BATCH_SIZE = config('FILE_CLEANUP_BATCH_SIZE', default=1000, cast=int)
+FILE_CLEANUP_WORKERS = config('FILE_CLEANUP_WORKERS', default=8, cast=int)
+# Bu süreden yeni dosyalar sahipsiz olsa da silinmez (export indirmeleri, yarım kalan yüklemeler)
+MEDIA_ORPHAN_MIN_AGE_HOURS = config('MEDIA_ORPHAN_MIN_AGE_HOURS', default=48, cast=int)
+
+# Veritabanı yedekleri (herkese açık MEDIA_ROOT dışında tutulur)
+BACKUP_ROOT = config('BACKUP_ROOT', default=str(BASE_DIR.parent / 'backups'))
+BACKUP_S3_PREFIX = config('BACKUP_S3_PREFIX', default='backups')
+BACKUP_TMP_DIR = config('BACKUP_TMP_DIR', default='')
+BACKUP_JOBS = config('BACKUP_JOBS', default=4, cast=int)
+BACKUP_COMPRESSION_LEVEL = config('BACKUP_COMPRESSION_LEVEL', default=6, cast=int)
+BACKUP_RETENTION_COUNT = config('BACKUP_RETENTION_COUNT', default=4, cast=int)
+BACKUP_VERIFY = config('BACKUP_VERIFY', default=True, cast=bool)
+# Paralel pg_dump/pg_restore pgbouncer transaction pooling üzerinden çalışmaz:
+# DATABASE_HOST pgbouncer ise yedekler için doğrudan PostgreSQL sunucusu verilmeli
+BACKUP_DATABASE_HOST = config('BACKUP_DATABASE_HOST', default='')
+BACKUP_DATABASE_PORT = config('BACKUP_DATABASE_PORT', default='')
+
+# Audit
+# 'signals': Python sinyalleri ile kayıt (varsayılan)
+# 'triggers': PostgreSQL trigger'ları ile kayıt (manage.py audit_triggers install)
+AUDIT_CAPTURE_MODE = config('AUDIT_CAPTURE_MODE', default='signals')
+
 # File Storage
 USE_S3 = config('USE_S3', default=False, cast=bool)
 if USE_S3:
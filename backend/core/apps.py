@@ -8,4 +8,5 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """Import signals when app is ready"""
-        import core.signals
\ No newline at end of file
+        import core.signals
+        import core.db_router  # Celery task yönlendirme sinyalleri
\ No newline at end of file
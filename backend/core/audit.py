@@ -0,0 +1,136 @@
+"""
+PostgreSQL trigger tabanlı değişiklik yakalama (audit)
+
+AUDIT_CAPTURE_MODE='triggers' olduğunda denetim kayıtları Python sinyalleri
+yerine statement-level trigger'lar tarafından audit_logs tablosuna yazılır.
+Böylece queryset.update() / toplu delete gibi sinyal tetiklemeyen işlemler de
+satır başına Python maliyeti olmadan kayıt altına alınır.
+
+Kullanıcı ve IP bilgisi, AuditContextMiddleware'in bağlantı üzerinde
+ayarladığı oturum değişkenlerinden (app.actor_id, app.client_ip) okunur.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+
+
+ACTOR_SETTING = 'app.actor_id'
+IP_SETTING = 'app.client_ip'
+
+# tablo adı -> audit_logs.object_type
+AUDITED_TABLES = {
+    'companies': 'Company',
+    'brands': 'Brand',
+    'branches': 'Branch',
+    'people': 'Person',
+    'contracts': 'Contract',
+    'promissory_notes': 'PromissoryNote',
+    'financial_records': 'FinancialRecord',
+}
+
+# Denetim kaydına yazılmayacak kolonlar (zaman damgaları ve hassas veriler)
+EXCLUDED_COLUMNS = ['created_at', 'updated_at', 'national_id', 'iban']
+
+FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION audit_capture_changes() RETURNS trigger AS $$
+DECLARE
+    v_actor integer := NULLIF(current_setting('%(actor)s', true), '')::integer;
+    v_ip inet := NULLIF(current_setting('%(ip)s', true), '')::inet;
+    v_excluded text[] := ARRAY[%(excluded)s];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO audit_logs (id, actor_id, action, object_type, object_id, changes, ip_address, timestamp)
+        SELECT gen_random_uuid(), v_actor, 'create', TG_ARGV[0], n.id::text,
+               to_jsonb(n) - v_excluded, v_ip, now()
+        FROM new_rows n;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO audit_logs (id, actor_id, action, object_type, object_id, changes, ip_address, timestamp)
+        SELECT gen_random_uuid(), v_actor, 'update', TG_ARGV[0], n.id::text,
+               d.changes, v_ip, now()
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        CROSS JOIN LATERAL (
+            SELECT jsonb_object_agg(
+                       nj.key, jsonb_build_object('old', oj.value, 'new', nj.value)
+                   ) AS changes
+            FROM jsonb_each(to_jsonb(n) - v_excluded) nj
+            JOIN jsonb_each(to_jsonb(o) - v_excluded) oj ON oj.key = nj.key
+            WHERE nj.value IS DISTINCT FROM oj.value
+        ) d
+        WHERE d.changes IS NOT NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO audit_logs (id, actor_id, action, object_type, object_id, changes, ip_address, timestamp)
+        SELECT gen_random_uuid(), v_actor, 'delete', TG_ARGV[0], o.id::text,
+               to_jsonb(o) - v_excluded, v_ip, now()
+        FROM old_rows o;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""" % {
+    'actor': ACTOR_SETTING,
+    'ip': IP_SETTING,
+    'excluded': ', '.join(f"'{column}'" for column in EXCLUDED_COLUMNS),
+}
+
+# PostgreSQL transition table'ları tek olaylı trigger'larda destekler,
+# bu yüzden her tablo için üç ayrı trigger oluşturulur.
+TRIGGER_SQL = {
+    'insert': 'AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows',
+    'update': 'AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'delete': 'AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def trigger_mode_enabled():
+    """Trigger tabanlı audit aktif mi?"""
+    return (
+        getattr(settings, 'AUDIT_CAPTURE_MODE', 'signals') == 'triggers'
+        and connection.vendor == 'postgresql'
+    )
+
+
+def _trigger_name(table, event):
+    return f'audit_{table}_{event}'
+
+
+def install_audit_triggers(using=None):
+    """Audit fonksiyonunu ve tablo trigger'larını oluştur"""
+    conn = connections[using or 'default']
+
+    with conn.cursor() as cursor:
+        cursor.execute(FUNCTION_SQL)
+        for table, object_type in AUDITED_TABLES.items():
+            for event, clause in TRIGGER_SQL.items():
+                name = _trigger_name(table, event)
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name} ON {table}')
+                cursor.execute(
+                    f'CREATE TRIGGER {name} {clause.format(table=table)} '
+                    f"FOR EACH STATEMENT EXECUTE FUNCTION audit_capture_changes('{object_type}')"
+                )
+
+
+def remove_audit_triggers(using=None):
+    """Audit trigger'larını ve fonksiyonunu kaldır"""
+    conn = connections[using or 'default']
+
+    with conn.cursor() as cursor:
+        for table in AUDITED_TABLES:
+            for event in TRIGGER_SQL:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {_trigger_name(table, event)} ON {table}')
+        cursor.execute('DROP FUNCTION IF EXISTS audit_capture_changes()')
+
+
+def set_audit_context(cursor, actor_id=None, ip_address=None, local=False):
+    """
+    Bağlantı oturumuna kullanıcı ve IP bilgisini yaz
+    local=True: yalnızca geçerli transaction için (pgbouncer transaction pooling)
+    """
+    if settings.DATABASE_POOL_MODE == 'transaction' and not local:
+        # Oturum düzeyi ayar başka istemcinin transaction'ına sızar
+        raise ImproperlyConfigured('Transaction pooling modunda audit bilgisi yalnızca local=True ile ayarlanabilir')
+    cursor.execute(
+        'SELECT set_config(%s, %s, %s), set_config(%s, %s, %s)',
+        [ACTOR_SETTING, str(actor_id or ''), local, IP_SETTING, ip_address or '', local]
+    )
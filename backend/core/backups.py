@@ -0,0 +1,262 @@
+"""
+Veritabanı yedekleri
+
+pg_dump dizin formatında (-Fd) ve BACKUP_JOBS paralel işle, sıkıştırılarak
+geçici bir klasöre alınır. Ardından dosyalar tek tek yedek storage'ına
+aktarılır. Bu storage S3 kullanılıyorsa özel bir önek, değilse MEDIA_ROOT
+dışındaki BACKUP_ROOT klasörüdür; yani herkese açık /media altında
+değildir.
+
+Her yedek storage'da <zaman damgası>/ klasöründe durur. Dosyaların boyut ve
+SHA-256 değerleri en son yazılan manifest.json'dadır; manifest'i olmayan
+yedek tamamlanmamış sayılır. Yükleme sonrası dosyalar storage'dan geri
+okunup doğrulanır. BACKUP_RETENTION_COUNT'tan eski yedekler silinir.
+
+Paralel pg_dump / pg_restore birden fazla oturum açar ve senkronize
+snapshot kullanır; bu pgbouncer transaction pooling üzerinden çalışmaz.
+Bu yüzden yedekler BACKUP_DATABASE_HOST / BACKUP_DATABASE_PORT ile
+doğrudan PostgreSQL sunucusuna bağlanır (boşsa DATABASE_HOST / PORT).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+from .file_cleanup import delete_files
+
+
+MANIFEST_NAME = 'manifest.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Yedekleme / geri yükleme hatası"""
+
+
+def get_backup_storage():
+    """Yedeklerin yazılacağı storage (herkese açık medya dışında)"""
+    if settings.USE_S3:
+        from storages.backends.s3boto3 import S3Boto3Storage
+        return S3Boto3Storage(location=settings.BACKUP_S3_PREFIX, default_acl='private')
+    return FileSystemStorage(location=settings.BACKUP_ROOT, base_url=None)
+
+
+def get_backup_db_config():
+    """Yedekleme bağlantı ayarları: pgbouncer yerine doğrudan veritabanı sunucusu"""
+    db_config = dict(settings.DATABASES['default'])
+    if settings.BACKUP_DATABASE_HOST:
+        db_config['HOST'] = settings.BACKUP_DATABASE_HOST
+    if settings.BACKUP_DATABASE_PORT:
+        db_config['PORT'] = settings.BACKUP_DATABASE_PORT
+    return db_config
+
+
+def _pg_env(db_config):
+    env = os.environ.copy()
+    env['PGPASSWORD'] = db_config['PASSWORD']
+    return env
+
+
+def _pg_connection_args(db_config):
+    args = ['-h', db_config['HOST'], '-U', db_config['USER']]
+    if db_config.get('PORT'):
+        args += ['-p', str(db_config['PORT'])]
+    return args
+
+
+def _sha256(fileobj):
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _upload(storage, backup_name, dump_dir, filename):
+    path = os.path.join(dump_dir, filename)
+    with open(path, 'rb') as f:
+        checksum = _sha256(f)
+        f.seek(0)
+        storage.save(f'{backup_name}/{filename}', File(f, name=filename))
+    return filename, {'size': os.path.getsize(path), 'sha256': checksum}
+
+
+def verify_backup(storage, backup_name, manifest=None):
+    """Storage'daki dosyaların SHA-256 değerlerini manifest ile karşılaştır"""
+    manifest = manifest or read_manifest(storage, backup_name)
+
+    def check(item):
+        filename, expected = item
+        with storage.open(f'{backup_name}/{filename}', 'rb') as f:
+            return filename, _sha256(f) == expected['sha256']
+
+    with ThreadPoolExecutor(max_workers=settings.BACKUP_JOBS) as executor:
+        invalid = [name for name, ok in executor.map(check, manifest['files'].items()) if not ok]
+    if invalid:
+        raise BackupError(f"Checksum uyuşmuyor: {', '.join(sorted(invalid))}")
+
+
+def read_manifest(storage, backup_name):
+    with storage.open(f'{backup_name}/{MANIFEST_NAME}', 'rb') as f:
+        return json.load(f)
+
+
+def _list_directories(storage):
+    try:
+        directories, _ = storage.listdir('')
+    except FileNotFoundError:
+        return []
+    return directories
+
+
+def list_backups(storage):
+    """Tamamlanmış yedekler, en yeniden eskiye"""
+    directories = _list_directories(storage)
+    return sorted(
+        (name for name in directories if storage.exists(f'{name}/{MANIFEST_NAME}')),
+        reverse=True,
+    )
+
+
+def apply_retention(storage):
+    """En yeni BACKUP_RETENTION_COUNT yedek dışındakileri sil; dönüş: silinen yedekler"""
+    directories = _list_directories(storage)
+    complete = list_backups(storage)
+    keep = set(complete[:settings.BACKUP_RETENTION_COUNT])
+    newest = complete[0] if complete else None
+
+    removed = []
+    for name in directories:
+        # Tamamlanmamış ama en son tam yedekten yeni olan klasör devam eden bir yedek olabilir
+        if name in keep or (newest and name > newest and name not in complete):
+            continue
+        _, files = storage.listdir(name)
+        names = [f'{name}/{filename}' for filename in files]
+        if len(delete_files(names, storage=storage)) != len(names):
+            continue
+        if isinstance(storage, FileSystemStorage):
+            # Dosya sisteminde boş kalan klasörü de kaldır
+            os.rmdir(storage.path(name))
+        removed.append(name)
+    return removed
+
+
+def create_backup():
+    """
+    Veritabanı yedeği al, storage'a aktar, doğrula ve eski yedekleri temizle
+    Dönüş: {'name', 'files', 'size', 'removed'}
+    """
+    db_config = get_backup_db_config()
+    storage = get_backup_storage()
+    backup_name = timezone.now().strftime('%Y%m%d_%H%M%S')
+
+    work_dir = tempfile.mkdtemp(prefix='pg-backup-', dir=settings.BACKUP_TMP_DIR or None)
+    dump_dir = os.path.join(work_dir, 'dump')
+    try:
+        subprocess.run(
+            [
+                'pg_dump',
+                *_pg_connection_args(db_config),
+                '-d', db_config['NAME'],
+                '-Fd',
+                '-j', str(settings.BACKUP_JOBS),
+                '-Z', str(settings.BACKUP_COMPRESSION_LEVEL),
+                '-f', dump_dir,
+            ],
+            env=_pg_env(db_config),
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+        filenames = sorted(os.listdir(dump_dir))
+        with ThreadPoolExecutor(max_workers=settings.BACKUP_JOBS) as executor:
+            files = dict(executor.map(
+                lambda filename: _upload(storage, backup_name, dump_dir, filename), filenames
+            ))
+    except subprocess.CalledProcessError as exc:
+        raise BackupError(f"pg_dump hatası: {exc.stderr.strip()}") from exc
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    manifest = {
+        'name': backup_name,
+        'database': db_config['NAME'],
+        'created_at': timezone.now().isoformat(),
+        'format': 'directory',
+        'jobs': settings.BACKUP_JOBS,
+        'compression': settings.BACKUP_COMPRESSION_LEVEL,
+        'files': files,
+    }
+    if settings.BACKUP_VERIFY:
+        verify_backup(storage, backup_name, manifest)
+
+    # Manifest en son yazılır: varlığı yedeğin tamamlandığını gösterir
+    storage.save(f'{backup_name}/{MANIFEST_NAME}', ContentFile(json.dumps(manifest, indent=2).encode()))
+
+    return {
+        'name': backup_name,
+        'files': len(files),
+        'size': sum(item['size'] for item in files.values()),
+        'removed': apply_retention(storage),
+    }
+
+
+def restore_test(backup_name=None, keep_database=False):
+    """
+    Yedeği indirip doğrula ve geçici bir veritabanına pg_restore ile yükle
+    Dönüş: {'name', 'database', 'tables'}
+    """
+    db_config = get_backup_db_config()
+    storage = get_backup_storage()
+
+    if backup_name is None:
+        backups = list_backups(storage)
+        if not backups:
+            raise BackupError('Tamamlanmış yedek bulunamadı')
+        backup_name = backups[0]
+
+    manifest = read_manifest(storage, backup_name)
+    target_db = f"{db_config['NAME']}_restore_test"
+    env = _pg_env(db_config)
+    connection_args = _pg_connection_args(db_config)
+
+    work_dir = tempfile.mkdtemp(prefix='pg-restore-', dir=settings.BACKUP_TMP_DIR or None)
+    try:
+        for filename, expected in manifest['files'].items():
+            path = os.path.join(work_dir, filename)
+            with storage.open(f'{backup_name}/{filename}', 'rb') as source, open(path, 'wb') as target:
+                shutil.copyfileobj(source, target, HASH_CHUNK_SIZE)
+            with open(path, 'rb') as f:
+                if _sha256(f) != expected['sha256']:
+                    raise BackupError(f"Checksum uyuşmuyor: {filename}")
+
+        subprocess.run(['dropdb', *connection_args, '--if-exists', target_db], env=env, check=True, capture_output=True, text=True)
+        subprocess.run(['createdb', *connection_args, target_db], env=env, check=True, capture_output=True, text=True)
+        subprocess.run(
+            ['pg_restore', *connection_args, '-d', target_db, '-j', str(settings.BACKUP_JOBS),
+             '--no-owner', '--exit-on-error', work_dir],
+            env=env, check=True, capture_output=True, text=True,
+        )
+        tables = subprocess.run(
+            ['psql', *connection_args, '-d', target_db, '-tA', '-c',
+             "SELECT count(*) FROM information_schema.tables WHERE table_schema = 'public'"],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except subprocess.CalledProcessError as exc:
+        raise BackupError(f"{exc.cmd[0]} hatası: {exc.stderr.strip()}") from exc
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if not keep_database:
+            subprocess.run(['dropdb', *connection_args, '--if-exists', target_db], env=env, capture_output=True)
+
+    return {'name': backup_name, 'database': target_db, 'tables': int(tables or 0)}
@@ -0,0 +1,104 @@
+"""
+Koşullu GET (ETag / Last-Modified)
+
+Doğrulayıcılar yanıt serialize edilmeden, tek bir hafif sorguyla hesaplanır:
+listelerde filtrelenmiş kayıtların max(updated_at) değeri ve sayısı,
+detayda satırın updated_at değeri. Yanıtın içerdiği ilişkili modellerdeki
+değişiklikleri de yakalamak için ETag'e bu modellerin liste önbelleği nesil
+sayaçları eklenir (bkz. core/list_cache.py). İstemcinin If-None-Match /
+If-Modified-Since başlıkları eşleşirse 304 Not Modified döner.
+
+Listelerde Last-Modified gönderilmez: kayıt silindiğinde veya filtreden
+çıktığında max(updated_at) geriye gidebilir ya da aynı kalabilir ve
+If-Modified-Since yanlışlıkla 304 üretir. Listeler yalnızca sayıyı ve
+nesil sayaçlarını da içeren ETag ile doğrulanır.
+"""
+
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.filters import OrderingFilter
+
+from .list_cache import get_generations
+
+
+class ConditionalGetMixin:
+    """
+    list için ETag, retrieve için ETag / Last-Modified desteği
+    conditional_models: yanıtın bağlı olduğu modeller; None ise list_cache_models
+    """
+    conditional_models = None
+
+    def get_conditional_models(self):
+        if self.conditional_models is not None:
+            return self.conditional_models
+        return getattr(self, 'list_cache_models', ())
+
+    def get_validator_queryset(self):
+        """Doğrulayıcı sorgusu için annotation'sız temel queryset"""
+        return self.get_queryset().model._default_manager.all()
+
+    def filter_validator_queryset(self, queryset):
+        # Sıralama sonucu değiştirmez; annotation'lara göre sıralama da bu queryset'te yoktur
+        for backend in self.filter_backends:
+            if not issubclass(backend, OrderingFilter):
+                queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def make_etag(self, request, *parts):
+        raw = repr((
+            request.path,
+            sorted(request.query_params.lists()),
+            parts,
+            get_generations(self.get_conditional_models()),
+        ))
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    def conditional_response(self, request, etag, last_modified, get_response):
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = get_response()
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        # Tarayıcı her seferinde doğrulasın
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        validators = (
+            self.filter_validator_queryset(self.get_validator_queryset())
+            .order_by()
+            .aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        )
+        etag = self.make_etag(request, validators['last_modified'], validators['count'])
+        return self.conditional_response(
+            request, etag, None,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            updated_at = (
+                self.get_validator_queryset()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list('updated_at', flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            updated_at = None
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = self.make_etag(request, updated_at)
+        return self.conditional_response(
+            request, etag, updated_at,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
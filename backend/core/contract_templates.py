@@ -0,0 +1,165 @@
+"""
+Derlenmiş sözleşme şablonları
+
+Bir .docx şablonu worker başına bir kez açılır ve derlenir:
+- {{anahtar}} yer tutucuları, Word'ün metni birden fazla run'a bölmesine
+  rağmen bulunur ve ilk run'ın içinde tek parça haline getirilir
+  (run biçimlendirmesi korunur),
+- her XML parçası sabit byte dilimleri ile anahtarlar arasında bölünür.
+
+Render aşamasında yalnızca dilimler değerlerle birleştirilip zip yazılır;
+belge yeniden parse edilmez. Derlenmiş şablon dosyanın mtime değerine
+göre önbelleğe alınır, şablon değişince otomatik olarak yeniden derlenir.
+"""
+
+import os
+import re
+import threading
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_P = f'{{{W_NS}}}p'
+W_T = f'{{{W_NS}}}t'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+PLACEHOLDER_BYTES_RE = re.compile(rb'\{\{(\w+)\}\}')
+
+# Yer tutucu aranacak parçalar (gövde, üst ve alt bilgiler)
+TEMPLATE_PART_RE = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+
+def _owner_paragraph(node):
+    """Metin düğümünün ait olduğu en yakın paragraf"""
+    parent = node.getparent()
+    while parent is not None and parent.tag != W_P:
+        parent = parent.getparent()
+    return parent
+
+
+def _merge_split_placeholders(root):
+    """Birden fazla run'a bölünmüş yer tutucuları ilk run'da birleştir"""
+    texts_by_paragraph = {}
+    for node in root.iter(W_T):
+        texts_by_paragraph.setdefault(_owner_paragraph(node), []).append(node)
+
+    for nodes in texts_by_paragraph.values():
+        texts = [node.text or '' for node in nodes]
+        full_text = ''.join(texts)
+        if '{{' not in full_text:
+            continue
+
+        # Global ofset -> (düğüm sırası, yerel ofset)
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text)
+
+        def locate(offset):
+            """Karakter ofsetini içeren düğüm ve düğüm içi ofset"""
+            for index, start in enumerate(starts):
+                if start <= offset < start + len(texts[index]):
+                    return index, offset - start
+            raise ValueError(offset)
+
+        # Sondan başa: önceki eşleşmelerin ofsetleri bozulmaz
+        for match in reversed(list(PLACEHOLDER_RE.finditer(full_text))):
+            first, first_offset = locate(match.start())
+            last, last_offset = locate(match.end() - 1)
+            last_offset += 1
+            if first != last:
+                nodes[first].text = (nodes[first].text or '')[:first_offset] + match.group(0)
+                for index in range(first + 1, last):
+                    nodes[index].text = ''
+                nodes[last].text = (nodes[last].text or '')[last_offset:]
+            nodes[first].set(XML_SPACE, 'preserve')
+
+
+def _compile_part(xml_bytes):
+    """XML parçasını sabit dilimler ve anahtarlar listesine dönüştür"""
+    root = etree.fromstring(xml_bytes)
+    _merge_split_placeholders(root)
+    normalized = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    segments = []
+    position = 0
+    for match in PLACEHOLDER_BYTES_RE.finditer(normalized):
+        segments.append(normalized[position:match.start()])
+        segments.append(match.group(1).decode())
+        position = match.end()
+    segments.append(normalized[position:])
+    return segments
+
+
+class CompiledTemplate:
+    """Bir kez derlenip çok kez render edilen .docx şablonu"""
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.entries = []  # (ZipInfo, içerik byte'ları veya derlenmiş dilimler)
+
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                data = archive.read(info)
+                if TEMPLATE_PART_RE.match(info.filename):
+                    self.entries.append((info, _compile_part(data)))
+                else:
+                    self.entries.append((info, data))
+
+    @property
+    def placeholders(self):
+        """Şablondaki yer tutucu anahtarları"""
+        return sorted({
+            segment
+            for _, content in self.entries if isinstance(content, list)
+            for segment in content if isinstance(segment, str)
+        })
+
+    @staticmethod
+    def _render_part(segments, context):
+        parts = []
+        for segment in segments:
+            if isinstance(segment, str):
+                if segment in context:
+                    parts.append(escape(str(context[segment])).encode('utf-8'))
+                else:
+                    # Bilinmeyen anahtarlar olduğu gibi bırakılır
+                    parts.append(b'{{' + segment.encode() + b'}}')
+            else:
+                parts.append(segment)
+        return b''.join(parts)
+
+    def render(self, context):
+        """Şablonu verilen bağlamla doldurup .docx içeriğini BytesIO olarak döndür"""
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for info, content in self.entries:
+                if isinstance(content, list):
+                    content = self._render_part(content, context)
+                archive.writestr(info, content)
+        buffer.seek(0)
+        return buffer
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_compiled_template(path):
+    """Derlenmiş şablonu önbellekten al; dosya değiştiyse yeniden derle"""
+    mtime = os.path.getmtime(path)
+    compiled = _cache.get(path)
+    if compiled is None or compiled.mtime != mtime:
+        with _cache_lock:
+            compiled = _cache.get(path)
+            if compiled is None or compiled.mtime != mtime:
+                compiled = CompiledTemplate(path)
+                _cache[path] = compiled
+    return compiled
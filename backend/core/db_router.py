@@ -0,0 +1,73 @@
+"""
+Okuma replikalarına yönlendirme
+
+Yazmalar her zaman birincil veritabanına (default) gider. Okumalar yalnızca
+replica_reads() bağlamı içinde DATABASE_READ_REPLICAS'tan birine gönderilir:
+ReplicaRoutingMiddleware güvenli (GET/HEAD/OPTIONS) istekleri, Celery
+tarafında ise use_replica=True seçeneğiyle tanımlanan task'lar bu bağlamda
+çalışır. Transaction içindeki okumalar, kendi yazdığını görebilmesi için
+birincil veritabanında kalır.
+
+Yazma yapan bir istekten sonra aynı kullanıcının okumaları, replika
+gecikmesine takılmaması için DATABASE_REPLICA_PIN_SECONDS boyunca birincil
+veritabanına sabitlenir.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def replica_pin_cache_key(identity):
+    return f'db_replica_pin:{identity}'
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Bağlam içindeki okumaları (replika tanımlıysa) replikaya yönlendir"""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Okumaları replikalara, yazmaları ve migration'ları birincil veritabanına yönlendirir"""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_READ_REPLICAS
+        if not replicas or not _read_from_replica.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_READ_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_READ_REPLICAS
+
+
+@task_prerun.connect
+def _enter_task_routing(task=None, **kwargs):
+    _read_from_replica.set(getattr(task, 'use_replica', False))
+
+
+@task_postrun.connect
+def _exit_task_routing(**kwargs):
+    _read_from_replica.set(False)
@@ -0,0 +1,155 @@
+"""
+values() tabanlı liste serileştirme
+
+Liste serializer'ları her satır için model nesnesi oluşturup
+source='branch.brand.company.title' gibi zincirleri nesne nesne gezer.
+ValuesSerializer, aynı serializer'ın alanlarından bir values() planı
+türetir: gereken sütunlar join'lerle tek sorguda okunur ve her değer
+yalnızca alanın kendi to_representation'ından geçirilir. Çıktı,
+serializer'ınkiyle aynı JSON'dur (bkz. core/tests.py).
+
+Alan türleri:
+- model alanı veya ileri ilişki zinciri: tek values() sütunu
+- source='get_<alan>_display': seçenek etiketi
+- queryset annotation'ı
+- dosya alanı: değer FieldFile'a sarılır (URL üretimi serializer'daki gibi)
+- diğerleri (property, SerializerMethodField): serializer'ın values_computed
+  sözlüğünden {alan: ((lookup, ...), fonksiyon)}; isteğe bağlı üçüncü öğe,
+  boşsa alanı çıktıdan çıkaran ilişki lookup'larıdır
+
+Zincirdeki boş bir ilişki, DRF'te olduğu gibi alanı çıktıdan çıkarır.
+"""
+
+import re
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import FileField
+from django.utils.encoding import force_str
+from rest_framework.relations import PKOnlyObject, RelatedField
+from rest_framework.response import Response
+
+
+DISPLAY_SOURCE = re.compile(r'^get_(\w+)_display$')
+
+
+def _represent(field):
+    def represent(value):
+        return None if value is None else field.to_representation(value)
+    return represent
+
+
+def _represent_pk(field):
+    def represent(value):
+        return None if value is None else field.to_representation(PKOnlyObject(pk=value))
+    return represent
+
+
+def _represent_file(field, model_field):
+    def represent(value):
+        return field.to_representation(model_field.attr_class(None, model_field, value))
+    return represent
+
+
+def _represent_display(field, model_field):
+    choices = dict(model_field.flatchoices)
+
+    def represent(value):
+        label = choices.get(value, value)
+        return None if label is None else field.to_representation(force_str(label, strings_only=True))
+    return represent
+
+
+class ValuesSerializer:
+    """Bir liste serializer'ının values() karşılığı"""
+
+    def __init__(self, serializer_class, queryset, context=None):
+        serializer = serializer_class(context=context or {})
+        computed = getattr(serializer_class, 'values_computed', {})
+        annotations = queryset.query.annotations
+
+        # (alan adı, değer lookup'ları, boş olmaması gereken ilişki lookup'ları, dönüştürücü)
+        self.columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in computed:
+                lookups, func, *rest = computed[name]
+                guards = rest[0] if rest else ()
+                self.columns.append((name, tuple(lookups), tuple(guards), func))
+            elif len(field.source_attrs) == 1 and field.source_attrs[0] in annotations:
+                self.columns.append((name, (field.source_attrs[0],), (), _represent(field)))
+            else:
+                self.columns.append(self._resolve(serializer_class, queryset.model, name, field))
+
+        self.lookups = list(dict.fromkeys(
+            lookup
+            for _, lookups, guards, _ in self.columns
+            for lookup in (*lookups, *guards)
+        ))
+
+    @staticmethod
+    def _resolve(serializer_class, model, name, field):
+        def unsupported():
+            return ImproperlyConfigured(
+                f"{serializer_class.__name__}.{name}: values() ile okunamıyor, "
+                f"values_computed içinde tanımlayın"
+            )
+
+        *relations, leaf = field.source_attrs
+        path, guards = [], []
+        try:
+            for attr in relations:
+                relation = model._meta.get_field(attr)
+                if not (relation.many_to_one or relation.one_to_one) or not relation.concrete:
+                    raise unsupported()
+                if relation.null:
+                    guards.append('__'.join([*path, relation.attname]))
+                path.append(attr)
+                model = relation.related_model
+
+            display = DISPLAY_SOURCE.match(leaf)
+            if display:
+                model_field = model._meta.get_field(display.group(1))
+                if not model_field.choices:
+                    raise unsupported()
+                return name, ('__'.join([*path, model_field.name]),), tuple(guards), \
+                    _represent_display(field, model_field)
+
+            model_field = model._meta.get_field(leaf)
+        except FieldDoesNotExist:
+            raise unsupported()
+
+        lookup = '__'.join([*path, leaf])
+        if model_field.is_relation:
+            if not (isinstance(field, RelatedField) and field.use_pk_only_optimization()):
+                raise unsupported()
+            return name, (lookup,), tuple(guards), _represent_pk(field)
+        if isinstance(model_field, FileField):
+            return name, (lookup,), tuple(guards), _represent_file(field, model_field)
+        return name, (lookup,), tuple(guards), _represent(field)
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookups, guards, func in self.columns:
+            if any(row[guard] is None for guard in guards):
+                continue
+            data[name] = func(*(row[lookup] for lookup in lookups))
+        return data
+
+    def values(self, queryset):
+        # values() ile prefetch kullanılamaz; select_related zaten yok sayılır
+        return queryset.prefetch_related(None).values(*self.lookups)
+
+
+class ValuesListMixin:
+    """list action'ını model nesnesi oluşturmadan values() ile serileştir"""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = ValuesSerializer(self.get_serializer_class(), queryset, self.get_serializer_context())
+        rows = serializer.values(queryset)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([serializer.to_representation(row) for row in page])
+        return Response([serializer.to_representation(row) for row in rows])
@@ -0,0 +1,71 @@
+"""
+Storage dosyalarının toplu silinmesi
+
+S3 uyumlu storage'da dosyalar tek istekte 1000 anahtara kadar silen
+delete_objects ile, dosya sisteminde ise thread pool ile paralel silinir.
+Çağıranlar yalnızca gerçekten silinen dosyaların satırlarını kaldırır.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects isteği başına en fazla anahtar sayısı
+S3_DELETE_BATCH_SIZE = 1000
+
+
+def is_s3_storage(storage):
+    return hasattr(storage, 'bucket') and hasattr(storage, '_normalize_name')
+
+
+def _delete_s3_batch(storage, names):
+    keys = {storage._normalize_name(name): name for name in names}
+    try:
+        response = storage.bucket.meta.client.delete_objects(
+            Bucket=storage.bucket.name,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': False},
+        )
+    except Exception as exc:
+        logger.warning(f"{len(keys)} dosyalık silme isteği başarısız: {exc}")
+        return set()
+    for error in response.get('Errors', []):
+        logger.warning(f"Dosya silinemedi: {error.get('Key')} ({error.get('Code')})")
+    return {keys[item['Key']] for item in response.get('Deleted', []) if item['Key'] in keys}
+
+
+def _delete_local_file(storage, name):
+    try:
+        storage.delete(name)
+    except OSError as exc:
+        logger.warning(f"Dosya silinemedi: {name} ({exc})")
+        return None
+    return name
+
+
+def delete_files(names, storage=None):
+    """
+    Dosyaları paralel olarak sil
+    Dönüş: silinen (veya zaten bulunmayan) dosya adları kümesi
+    """
+    storage = storage or default_storage
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        return set()
+
+    workers = settings.FILE_CLEANUP_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if is_s3_storage(storage):
+            batches = [
+                names[index:index + S3_DELETE_BATCH_SIZE]
+                for index in range(0, len(names), S3_DELETE_BATCH_SIZE)
+            ]
+            results = executor.map(lambda batch: _delete_s3_batch(storage, batch), batches)
+            return set().union(*results)
+
+        results = executor.map(lambda name: _delete_local_file(storage, name), names)
+        return {name for name in results if name is not None}
@@ -139,12 +139,9 @@ class PromissoryNoteFilter(django_filters.FilterSet):
 
     def filter_is_overdue(self, queryset, name, value):
         """Vadesi geçmiş senetleri filtrele"""
-        from django.utils import timezone
+        from .lifecycle import overdue_notes_condition
         if value:
-            return queryset.filter(
-                due_date__lt=timezone.now().date(),
-                payment_status='pending'
-            )
+            return queryset.filter(overdue_notes_condition())
         return queryset
 
 
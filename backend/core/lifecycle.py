@@ -0,0 +1,92 @@
+"""
+Sözleşme ve senet durum geçişleri
+
+Zamana bağlı geçişler (süresi dolan sözleşme, vadesi geçen senet) Celery
+Beat ile her gün uygulanır. Geçişler LIFECYCLE_BATCH_SIZE kayıtlık
+parçalar halinde, her parça ayrı kısa bir transaction'da yapılır; böylece
+tablo üzerinde uzun süreli kilit tutulmaz. Her parça için tek bir audit
+kaydı yazılır ve status_transitioned sinyali bir kez gönderilir.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import AuditLog, Contract, PromissoryNote
+
+
+# Parça başına bir kez gönderilir: sender=model, field, from_status,
+# to_status, object_ids
+status_transitioned = Signal()
+
+
+def overdue_notes_condition(today=None):
+    """
+    Vadesi geçmiş senetler: geçişi uygulanmış olanlar ve henüz uygulanmamış
+    (bugün vadesi dolan) bekleyenler. Her iki kol da kısmi index kullanır.
+    """
+    today = today or timezone.now().date()
+    return Q(payment_status='overdue') | Q(payment_status='pending', due_date__lt=today)
+
+
+def apply_transition(model, field, from_status, to_status, condition, batch_size=None):
+    """
+    `field` değeri from_status olan ve condition'ı sağlayan kayıtları
+    parça parça to_status durumuna taşı. Dönüş: güncellenen kayıt sayısı
+    """
+    batch_size = batch_size or settings.LIFECYCLE_BATCH_SIZE
+    pending = model.objects.filter(condition, **{field: from_status})
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            object_ids = list(
+                pending.select_for_update(skip_locked=True)
+                .order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not object_ids:
+                break
+
+            updated = model.objects.filter(pk__in=object_ids).update(
+                **{field: to_status, 'updated_at': timezone.now()}
+            )
+            AuditLog.objects.create(
+                action='status_transition',
+                object_type=model.__name__,
+                object_id='batch',
+                changes={
+                    'field': field,
+                    'from': from_status,
+                    'to': to_status,
+                    'count': updated,
+                    'object_ids': [str(object_id) for object_id in object_ids],
+                }
+            )
+
+        status_transitioned.send(
+            sender=model,
+            field=field,
+            from_status=from_status,
+            to_status=to_status,
+            object_ids=object_ids,
+        )
+        total += updated
+
+        if len(object_ids) < batch_size:
+            break
+
+    return total
+
+
+def expire_contracts(today=None):
+    """Bitiş tarihi geçmiş aktif sözleşmeleri expired yap"""
+    today = today or timezone.now().date()
+    return apply_transition(Contract, 'status', 'active', 'expired', Q(end_date__lt=today))
+
+
+def mark_overdue_notes(today=None):
+    """Vadesi geçmiş bekleyen senetleri overdue yap"""
+    today = today or timezone.now().date()
+    return apply_transition(PromissoryNote, 'payment_status', 'pending', 'overdue', Q(due_date__lt=today))
@@ -0,0 +1,98 @@
+"""
+Liste yanıtı önbelleği
+
+CachedListMixin kullanan ViewSet'lerin list yanıtları şu anahtarla
+önbelleğe alınır: ViewSet, normalize edilmiş query parametreleri, kullanıcı
+kapsamı ve list_cache_models'teki her modelin nesil (generation) sayacı.
+
+Sayaçlar modellerin save/delete sinyallerinde (ve toplu durum geçişlerinde)
+transaction commit edildikten sonra artırılır (bkz. core/signals.py).
+Geçersiz kılma tek bir INCR'dır; eski anahtarlar bir daha okunmaz ve
+süreleri dolunca düşer. Önbellek dolarken veri birincil veritabanından
+okunur, böylece gecikmeli bir replikadaki eski veri yeni nesle yazılmaz.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .db_router import replica_reads
+from .models import (
+    Branch, Brand, Company, Contract, FinancialRecord, Person,
+    PromissoryNote, Report, Role
+)
+
+
+# Nesil sayacı tutulan modeller
+LIST_CACHE_MODELS = (
+    Company, Brand, Branch, Role, Person, Report,
+    Contract, PromissoryNote, FinancialRecord,
+)
+
+
+def generation_cache_key(model):
+    return f'list-generation:{model._meta.label_lower}'
+
+
+def get_generations(models):
+    """Modellerin güncel nesil sayaçları (yoksa başlatılır)"""
+    keys = [generation_cache_key(model) for model in models]
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        # Düşen bir sayaç eski bir değerle yeniden başlamasın diye zaman kullanılır
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        values.update(cache.get_many(missing))
+    return [values.get(key, 0) for key in keys]
+
+
+def bump_generation(model):
+    """Modelin nesil sayacını artır: önbellekteki listeleri geçersiz kılar"""
+    key = generation_cache_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+class CachedListMixin:
+    """
+    list action'ı için opt-in yanıt önbelleği
+    list_cache_models: yanıtın bağlı olduğu modeller (annotation ve ilişkiler dahil)
+    list_cache_per_user: queryset kullanıcıya göre değişiyorsa True
+    """
+    list_cache_models = ()
+    list_cache_per_user = False
+
+    def get_list_cache_key(self, request):
+        params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        scope = f'user:{request.user.pk}' if self.list_cache_per_user else 'shared'
+        generations = get_generations(self.list_cache_models)
+        raw = repr((
+            f'{type(self).__module__}.{type(self).__qualname__}',
+            # Sayfalama linkleri mutlak URL içerir
+            request.build_absolute_uri(request.path),
+            params,
+            scope,
+            generations,
+        ))
+        return f'list-response:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+    def list(self, request, *args, **kwargs):
+        if not settings.LIST_CACHE_ENABLED or not self.list_cache_models:
+            return super().list(request, *args, **kwargs)
+
+        cache_key = self.get_list_cache_key(request)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        with replica_reads(False):
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(cache_key, response.data, settings.LIST_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,37 @@
+"""
+Django management command for PostgreSQL audit triggers
+Usage: python manage.py audit_triggers install|remove
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.audit import install_audit_triggers, remove_audit_triggers, AUDITED_TABLES
+
+
+class Command(BaseCommand):
+    help = 'Installs or removes trigger-based change capture on audited tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['install', 'remove'])
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias',
+        )
+
+    def handle(self, *args, **options):
+        if connections[options['database']].vendor != 'postgresql':
+            raise CommandError('Audit trigger\'ları yalnızca PostgreSQL üzerinde desteklenir')
+
+        if options['action'] == 'install':
+            install_audit_triggers(options['database'])
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {len(AUDITED_TABLES)} tablo için audit trigger'ları kuruldu"
+            ))
+            self.stdout.write(
+                "AUDIT_CAPTURE_MODE=triggers ayarını etkinleştirmeyi unutmayın."
+            )
+        else:
+            remove_audit_triggers(options['database'])
+            self.stdout.write(self.style.SUCCESS("✓ Audit trigger'ları kaldırıldı"))
@@ -0,0 +1,47 @@
+"""
+Django management command to remove media files without a database row
+Usage: python manage.py cleanup_orphaned_media [--dry-run] [--min-age-hours 48]
+"""
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from core.media_gc import cleanup_all_media
+
+
+class Command(BaseCommand):
+    help = 'Deletes media files that are no longer referenced by any database row'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report orphaned files, do not delete them',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=int,
+            default=None,
+            help='Skip files newer than this (default: MEDIA_ORPHAN_MIN_AGE_HOURS)',
+        )
+
+    def handle(self, *args, **options):
+        results = cleanup_all_media(
+            min_age_hours=options['min_age_hours'],
+            dry_run=options['dry_run'],
+        )
+
+        for result in results:
+            if options['dry_run']:
+                self.stdout.write(
+                    f"{result.scanned} dosya tarandı, {result.orphans} sahipsiz dosya "
+                    f"({filesizeformat(result.reclaimed_bytes)}) silinebilir"
+                )
+                continue
+
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {result.scanned} dosya tarandı, {result.deleted}/{result.orphans} sahipsiz dosya silindi "
+                f"({filesizeformat(result.reclaimed_bytes)} kazanıldı)"
+            ))
+            if result.failed:
+                self.stdout.write(self.style.WARNING(f"{result.failed} dosya silinemedi (ayrıntılar logda)"))
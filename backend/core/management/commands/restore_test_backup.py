@@ -0,0 +1,41 @@
+"""
+Django management command to verify a database backup by restoring it
+Usage: python manage.py restore_test_backup [backup_name] [--keep] [--list]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.backups import BackupError, get_backup_storage, list_backups, restore_test
+
+
+class Command(BaseCommand):
+    help = 'Downloads a backup, verifies its checksums and restores it into a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('backup_name', nargs='?', help='Backup to test (default: latest)')
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the restored scratch database',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List completed backups and exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name in list_backups(get_backup_storage()):
+                self.stdout.write(name)
+            return
+
+        try:
+            result = restore_test(options['backup_name'], keep_database=options['keep'])
+        except BackupError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {result['name']} yedeği doğrulandı ve {result['database']} veritabanına yüklendi "
+            f"({result['tables']} tablo)"
+        ))
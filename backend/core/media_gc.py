@@ -0,0 +1,183 @@
+"""
+Sahipsiz medya dosyalarının temizlenmesi
+
+Storage listesi ve veritabanındaki dosya referansları ayrı ayrı sıralı
+akışlar olarak üretilir ve tek geçişte birleştirilerek (merge-diff)
+karşılaştırılır; hiçbir taraf belleğe alınmaz. Listede olup referansı
+bulunmayan ve MEDIA_ORPHAN_MIN_AGE_HOURS'tan eski dosyalar parçalar
+halinde silinir.
+
+Sıralama her iki tarafta da ikili (byte/codepoint) sıradır: S3 anahtarları
+bu sırayla listelenir, dosya sistemi buna göre gezilir, veritabanı
+sorguları da "C" / BINARY collation ile sıralanır.
+"""
+
+import heapq
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connection
+from django.db.models.functions import Collate
+
+from .file_cleanup import delete_files, is_s3_storage
+from .models import Contract, FinancialRecord, PromissoryNote, Report
+
+
+# Dosya alanı bulunan modeller
+FILE_REFERENCES = (
+    (Report, 'file'),
+    (Contract, 'file'),
+    (PromissoryNote, 'file'),
+    (FinancialRecord, 'attachments'),
+)
+
+# Temizlenecek storage önekleri (upload_to klasörleri ve export çıktıları)
+MANAGED_PREFIXES = (
+    'contracts/',
+    'exports/',
+    'financial_records/',
+    'promissory_notes/',
+    'reports/',
+)
+
+
+@dataclass
+class OrphanCleanupResult:
+    scanned: int = 0
+    orphans: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+    failed: int = 0
+
+
+def _iter_local_files(storage, prefix):
+    """Dosya sistemini ikili sırada gez: (ad, boyut, değiştirilme zamanı)"""
+    root = os.path.join(storage.location, prefix)
+
+    def walk(directory, relative):
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+        # Klasör adları '/' ile karşılaştırılır, böylece sıra tam yol sırasıyla aynı olur
+        entries.sort(key=lambda entry: entry.name + '/' if entry.is_dir(follow_symlinks=False) else entry.name)
+        for entry in entries:
+            name = f'{relative}{entry.name}'
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(entry.path, f'{name}/')
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                yield name, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc)
+
+    yield from walk(root, prefix)
+
+
+def _iter_s3_files(storage, prefix):
+    """S3 anahtarlarını sayfa sayfa listele (S3 ikili sırada döndürür)"""
+    base = f"{storage.location.strip('/')}/" if storage.location else ''
+    location = f'{base}{prefix}'
+    strip = len(base)
+    paginator = storage.bucket.meta.client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=storage.bucket.name, Prefix=location):
+        for item in page.get('Contents', []):
+            yield item['Key'][strip:], item['Size'], item['LastModified']
+
+
+def iter_storage_files(storage, prefixes=MANAGED_PREFIXES):
+    """Storage'daki dosyaları ikili sırada üret"""
+    for prefix in sorted(prefixes):
+        if is_s3_storage(storage):
+            yield from _iter_s3_files(storage, prefix)
+        else:
+            yield from _iter_local_files(storage, prefix)
+
+
+def iter_referenced_names():
+    """Veritabanındaki dosya referanslarını ikili sırada, tekrarsız üret"""
+    collation = 'C' if connection.vendor == 'postgresql' else 'BINARY'
+    streams = []
+    for model, field_name in FILE_REFERENCES:
+        queryset = (
+            model.objects.exclude(**{field_name: ''})
+            .exclude(**{f'{field_name}__isnull': True})
+            .order_by(Collate(field_name, collation))
+            .values_list(field_name, flat=True)
+        )
+        streams.append(queryset.iterator(chunk_size=5000))
+
+    previous = None
+    for name in heapq.merge(*streams):
+        if name != previous:
+            yield name
+            previous = name
+
+
+def iter_orphans(files, references):
+    """İki sıralı akışın farkı: referansı olmayan storage dosyaları"""
+    references = iter(references)
+    reference = next(references, None)
+    for item in files:
+        name = item[0]
+        while reference is not None and reference < name:
+            reference = next(references, None)
+        if reference != name:
+            yield item
+
+
+def cleanup_orphaned_media(storage=None, prefixes=MANAGED_PREFIXES, min_age_hours=None, dry_run=False):
+    """Sahipsiz dosyaları bul ve parçalar halinde sil"""
+    storage = storage or default_storage
+    if min_age_hours is None:
+        min_age_hours = settings.MEDIA_ORPHAN_MIN_AGE_HOURS
+    # Yeni yüklenen, satırı henüz commit edilmemiş dosyalar silinmesin
+    cutoff = datetime.now(dt_timezone.utc) - timedelta(hours=min_age_hours)
+    batch_size = settings.FILE_CLEANUP_BATCH_SIZE
+
+    result = OrphanCleanupResult()
+
+    def scanned(files):
+        for item in files:
+            result.scanned += 1
+            yield item
+
+    batch = {}
+
+    def flush():
+        deleted = delete_files(batch, storage=storage)
+        result.deleted += len(deleted)
+        result.reclaimed_bytes += sum(size for name, size in batch.items() if name in deleted)
+        result.failed += len(batch) - len(deleted)
+        batch.clear()
+
+    orphans = iter_orphans(scanned(iter_storage_files(storage, prefixes)), iter_referenced_names())
+    for name, size, modified in orphans:
+        if modified > cutoff:
+            continue
+        result.orphans += 1
+        if dry_run:
+            result.reclaimed_bytes += size
+            continue
+        batch[name] = size
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return result
+
+
+def cleanup_all_media(min_age_hours=None, dry_run=False):
+    """
+    Varsayılan storage'ı ve (S3 kullanılıyorsa) yerel MEDIA_ROOT'a yazılan
+    export dosyalarını temizle
+    """
+    results = [cleanup_orphaned_media(min_age_hours=min_age_hours, dry_run=dry_run)]
+    if not isinstance(default_storage, FileSystemStorage):
+        results.append(cleanup_orphaned_media(
+            FileSystemStorage(location=settings.MEDIA_ROOT), ('exports/',), min_age_hours, dry_run
+        ))
+    return results
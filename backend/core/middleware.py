@@ -0,0 +1,256 @@
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection, transaction
+
+from .audit import trigger_mode_enabled, set_audit_context
+from .db_router import replica_pin_cache_key, replica_reads
+
+
+try:
+    import brotli
+except ImportError:  # brotli kurulu değilse yalnızca gzip
+    brotli = None
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Sıkıştırılacak içerik tipleri (dosyalar ve event-stream hariç)
+COMPRESSIBLE_CONTENT_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+)
+
+
+def get_client_ip(request):
+    """İstemci IP adresini al (nginx X-Real-IP / X-Forwarded-For destekli)"""
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded_for:
+        return forwarded_for.split(',')[0].strip()
+    return request.META.get('HTTP_X_REAL_IP') or request.META.get('REMOTE_ADDR')
+
+
+class AuditContextMiddleware:
+    """
+    Trigger tabanlı audit için kullanıcı ve IP bilgisini veritabanı oturumuna taşır.
+
+    JWT kimlik doğrulaması DRF view'ı içinde yapıldığından kullanıcı middleware
+    aşamasında henüz belli değildir. Bu yüzden bilgi, istekteki ilk yazma
+    sorgusundan hemen önce bir execute wrapper ile ayarlanır; salt okunur
+    isteklerde ek sorgu çalıştırılmaz.
+    """
+
+    def __init__(self, get_response):
+        if not trigger_mode_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.DATABASE_POOL_MODE == 'transaction':
+            return self._call_with_transaction_pooling(request)
+
+        state = {'applied': False}
+
+        def wrapper(execute, sql, params, many, context):
+            if not state['applied'] and sql.lstrip()[:6].upper() != 'SELECT':
+                set_audit_context(context['cursor'].cursor, *self._audit_context(request))
+                state['applied'] = True
+            return execute(sql, params, many, context)
+
+        try:
+            with connection.execute_wrapper(wrapper):
+                return self.get_response(request)
+        finally:
+            if state['applied']:
+                self._reset_audit_context()
+
+    @staticmethod
+    def _reset_audit_context():
+        """Kalıcı bağlantılarda bilgi sonraki isteğe sızmasın (view hata verse de)"""
+        try:
+            with connection.cursor() as cursor:
+                set_audit_context(cursor)
+        except DatabaseError:
+            # Sıfırlanamayan bağlantı yeniden kullanılmaz
+            connection.close()
+
+    @staticmethod
+    def _audit_context(request):
+        user = getattr(request, 'user', None)
+        actor_id = user.pk if user is not None and user.is_authenticated else None
+        return actor_id, get_client_ip(request)
+
+    def _call_with_transaction_pooling(self, request):
+        """
+        pgbouncer transaction pooling: ardışık transaction'lar farklı sunucu
+        bağlantılarına düşebilir ve oturum ayarları başka istemcilere sızar.
+        Bu yüzden bilgi her yazma sorgusundan önce transaction'a yerel olarak
+        ayarlanır; transaction dışındaki yazmalar kısa bir transaction'a alınır.
+        """
+        def wrapper(execute, sql, params, many, context):
+            if sql.lstrip()[:6].upper() not in ('INSERT', 'UPDATE', 'DELETE'):
+                return execute(sql, params, many, context)
+
+            db = context['connection']
+            if db.in_atomic_block:
+                set_audit_context(context['cursor'].cursor, *self._audit_context(request), local=True)
+                return execute(sql, params, many, context)
+
+            with transaction.atomic(using=db.alias):
+                set_audit_context(context['cursor'].cursor, *self._audit_context(request), local=True)
+                return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(wrapper):
+            return self.get_response(request)
+
+
+def get_request_identity(request):
+    """
+    Kullanıcıyı veritabanına gitmeden tanımla: JWT'deki kullanıcı, yoksa
+    oturum anahtarı, o da yoksa istemci IP adresi
+    """
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken
+    from rest_framework_simplejwt.settings import api_settings
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token:
+        try:
+            token = authentication.get_validated_token(raw_token)
+            return f'user:{token[api_settings.USER_ID_CLAIM]}'
+        except (InvalidToken, KeyError):
+            pass
+
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f'session:{session.session_key}'
+    return f'ip:{get_client_ip(request)}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Güvenli isteklerin okumalarını replikalara yönlendirir (bkz. core/db_router.py).
+
+    Başarılı bir yazma isteğinden sonra kullanıcı DATABASE_REPLICA_PIN_SECONDS
+    boyunca birincil veritabanına sabitlenir; böylece kendi yaptığı değişikliği
+    gecikmeli bir replikadan okumaz.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_READ_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pin_key = replica_pin_cache_key(get_request_identity(request))
+
+        if request.method in SAFE_METHODS:
+            with replica_reads(not cache.get(pin_key)):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if response.status_code < 400:
+            cache.set(pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+        return response
+
+
+def get_accepted_encodings(request):
+    """Accept-Encoding başlığı: {kodlama: q değeri}"""
+    encodings = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def compress_brotli(content, quality, max_random_bytes):
+    """
+    brotli ile sıkıştır ve BREACH'e karşı rastgele uzunlukta dolgu ekle
+
+    gzip'teki dosya adı alanının karşılığı olarak akış başlığından hemen sonra
+    bir metadata meta-block'u (RFC 7932, 9.2) yazılır; çözücüler bu baytları
+    atlar. Başlıktan sonraki flush çıktıyı bayt sınırına hizalar.
+    """
+    # Uzunluk tek baytla yazılır (MSKIPBYTES=1): en fazla 256
+    length = secrets.randbelow(min(max_random_bytes, 256)) + 1
+    # ISLAST=0, MNIBBLES=0 (11), ayrılmış bit, MSKIPBYTES=1, MSKIPLEN-1; bayta hizalı
+    header = (0b11 << 1) | (1 << 4) | ((length - 1) << 6)
+
+    compressor = brotli.Compressor(quality=quality)
+    return b''.join([
+        compressor.flush(),
+        header.to_bytes(2, 'little'),
+        secrets.token_bytes(length),
+        compressor.process(content),
+        compressor.finish(),
+    ])
+
+
+class CompressionMiddleware:
+    """
+    Yanıtları istemcinin desteğine göre brotli (tercihli) veya gzip ile sıkıştırır.
+
+    Yalnızca COMPRESSION_MIN_LENGTH'ten büyük metin/JSON yanıtlar sıkıştırılır;
+    streaming yanıtlar (SSE, dosya indirme) olduğu gibi bırakılır. Her iki
+    kodlamada da Django'nun GZipMiddleware'i gibi BREACH'e karşı rastgele
+    dolgu eklenir (bkz. compress_brotli).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+            return response
+
+        accepted = get_accepted_encodings(request)
+        if brotli is not None and accepted.get('br', 0) > 0:
+            encoding = 'br'
+            compressed = compress_brotli(
+                response.content, settings.COMPRESSION_BROTLI_QUALITY, GZipMiddleware.max_random_bytes
+            )
+        elif accepted.get('gzip', accepted.get('*', 0)) > 0:
+            encoding = 'gzip'
+            compressed = compress_string(response.content, max_random_bytes=GZipMiddleware.max_random_bytes)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # İçerik kodlaması değişti: güçlü ETag zayıflatılır
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('company', 'Şirket'), ('brand', 'Marka'), ('branch', 'Şube'), ('person', 'Kişi')], max_length=20, verbose_name='Kapsam')),
+                ('entity_id', models.UUIDField(verbose_name='Nesne ID')),
+                ('date', models.DateField(verbose_name='Tarih')),
+                ('record_count', models.IntegerField(default=0, verbose_name='Kayıt Sayısı')),
+                ('total_income', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Gelir')),
+                ('total_expense', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Gider')),
+                ('total_turnover', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Ciro')),
+                ('computed_at', models.DateTimeField(verbose_name='Hesaplanma Zamanı')),
+            ],
+            options={
+                'verbose_name': 'Günlük Rapor Toplamı',
+                'verbose_name_plural': 'Günlük Rapor Toplamları',
+                'db_table': 'report_daily_aggregates',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='financialrecord',
+            index=models.Index(fields=['updated_at'], name='financial_r_updated_a53516_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reportdailyaggregate',
+            constraint=models.UniqueConstraint(fields=('scope', 'entity_id', 'date'), name='unique_daily_aggregate'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_report_daily_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentNumberCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=10, verbose_name='Önek')),
+                ('year', models.PositiveIntegerField(verbose_name='Yıl')),
+                ('last_value', models.PositiveIntegerField(default=0, verbose_name='Son Değer')),
+            ],
+            options={
+                'verbose_name': 'Belge Numarası Sayacı',
+                'verbose_name_plural': 'Belge Numarası Sayaçları',
+                'db_table': 'document_number_counters',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='documentnumbercounter',
+            constraint=models.UniqueConstraint(fields=('prefix', 'year'), name='unique_document_number_counter'),
+        ),
+    ]
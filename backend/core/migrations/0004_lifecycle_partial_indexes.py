@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_document_number_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['end_date'], name='contract_active_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='promissorynote',
+            index=models.Index(condition=models.Q(('payment_status', 'pending')), fields=['due_date'], name='note_pending_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='promissorynote',
+            index=models.Index(condition=models.Q(('payment_status', 'overdue')), fields=['due_date'], name='note_overdue_due_date_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_lifecycle_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyFinancialSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Ayın ilk günü', verbose_name='Dönem')),
+                ('record_count', models.IntegerField(default=0, verbose_name='Kayıt Sayısı')),
+                ('total_income', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Gelir')),
+                ('total_expense', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Gider')),
+                ('total_turnover', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Ciro')),
+                ('total_profit_share', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Toplam Kar Payı')),
+                ('net_profit', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Net Kar')),
+                ('computed_at', models.DateTimeField(verbose_name='Hesaplanma Zamanı')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='core.company', verbose_name='Şirket')),
+            ],
+            options={
+                'verbose_name': 'Aylık Mali Özet',
+                'verbose_name_plural': 'Aylık Mali Özetler',
+                'db_table': 'monthly_financial_summaries',
+                'ordering': ['-period', 'company'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyfinancialsummary',
+            constraint=models.UniqueConstraint(fields=('company', 'period'), name='unique_monthly_financial_summary'),
+        ),
+    ]
@@ -6,6 +6,47 @@ from django.utils.translation import gettext_lazy as _
 import uuid
 
 
+def annotatable_property(func):
+    """
+    Queryset'te aynı adla annotate edilebilen property: annotation değeri
+    atanmışsa o kullanılır, yoksa func ile hesaplanır
+    """
+    attname = f'_annotated_{func.__name__}'
+
+    def getter(self):
+        if attname in self.__dict__:
+            return self.__dict__[attname]
+        return func(self)
+
+    def setter(self, value):
+        self.__dict__[attname] = value
+
+    return property(getter, setter, doc=func.__doc__)
+
+
+def mask_national_id(national_id):
+    """TC Kimlik numarasını maskele"""
+    if national_id and len(national_id) == 11:
+        return f"{national_id[:3]}****{national_id[-2:]}"
+    return None
+
+
+def is_contract_active(status, end_date):
+    """Sözleşme yürürlükte mi: aktif ve bitiş tarihi geçmemiş"""
+    from django.utils import timezone
+    if status != 'active':
+        return False
+    return not (end_date and end_date < timezone.now().date())
+
+
+def is_note_overdue(payment_status, due_date):
+    """Vadesi geçmiş: overdue'ya taşınmış veya vadesi dolmuş bekleyen (bkz. overdue_notes_condition)"""
+    from django.utils import timezone
+    if payment_status == 'overdue':
+        return True
+    return payment_status == 'pending' and due_date < timezone.now().date()
+
+
 class TimeStampedModel(models.Model):
     """Abstract base model with timestamp fields"""
     created_at = models.DateTimeField(auto_now_add=True)
@@ -73,15 +114,15 @@ class Company(TimeStampedModel):
     def __str__(self):
         return self.title
 
-    @property
+    @annotatable_property
     def brand_count(self):
         return self.brands.count()
 
-    @property
+    @annotatable_property
     def total_branches(self):
         return Branch.objects.filter(brand__company=self).count()
 
-    @property
+    @annotatable_property
     def total_people(self):
         return Person.objects.filter(branch__brand__company=self).count()
 
@@ -206,7 +247,7 @@ class Branch(TimeStampedModel):
     def company(self):
         return self.brand.company
 
-    @property
+    @annotatable_property
     def employee_count(self):
         return self.people.filter(role__name='employee').count()
 
@@ -328,9 +369,7 @@ class Person(TimeStampedModel):
     @property
     def masked_national_id(self):
         """TC Kimlik numarasını maskele"""
-        if self.national_id and len(self.national_id) == 11:
-            return f"{self.national_id[:3]}****{self.national_id[-2:]}"
-        return None
+        return mask_national_id(self.national_id)
 
     @property
     def masked_iban(self):
@@ -560,6 +599,12 @@ class Contract(TimeStampedModel):
             models.Index(fields=['status']),
             models.Index(fields=['start_date']),
             models.Index(fields=['end_date']),
+            # Süre dolumu / yaklaşan bitiş sorguları yalnızca aktif sözleşmelere bakar
+            models.Index(
+                fields=['end_date'],
+                condition=models.Q(status='active'),
+                name='contract_active_end_date_idx'
+            ),
         ]
 
     def __str__(self):
@@ -567,12 +612,7 @@ class Contract(TimeStampedModel):
 
     @property
     def is_active(self):
-        from django.utils import timezone
-        if self.status != 'active':
-            return False
-        if self.end_date and self.end_date < timezone.now().date():
-            return False
-        return True
+        return is_contract_active(self.status, self.end_date)
 
 
 class PromissoryNote(TimeStampedModel):
@@ -666,6 +706,17 @@ class PromissoryNote(TimeStampedModel):
             models.Index(fields=['note_number']),
             models.Index(fields=['payment_status']),
             models.Index(fields=['due_date']),
+            # Vade sorguları yalnızca bekleyen / vadesi geçmiş senetlere bakar
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(payment_status='pending'),
+                name='note_pending_due_date_idx'
+            ),
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(payment_status='overdue'),
+                name='note_overdue_due_date_idx'
+            ),
         ]
 
     def __str__(self):
@@ -673,8 +724,7 @@ class PromissoryNote(TimeStampedModel):
 
     @property
     def is_overdue(self):
-        from django.utils import timezone
-        return self.due_date < timezone.now().date() and self.payment_status == 'pending'
+        return is_note_overdue(self.payment_status, self.due_date)
 
 
 class FinancialRecord(TimeStampedModel):
@@ -781,12 +831,147 @@ class FinancialRecord(TimeStampedModel):
             models.Index(fields=['type']),
             models.Index(fields=['date']),
             models.Index(fields=['currency']),
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.amount} {self.currency}"
 
 
+class ReportDailyAggregate(models.Model):
+    """
+    Rapor için günlük kısmi toplamlar
+    Haftalık/aylık/yıllık raporlar ham kayıtlar yerine bu satırlardan toplanır.
+    """
+    scope = models.CharField(
+        max_length=20,
+        choices=Report.SCOPE_CHOICES,
+        verbose_name=_("Kapsam")
+    )
+    entity_id = models.UUIDField(verbose_name=_("Nesne ID"))
+    date = models.DateField(verbose_name=_("Tarih"))
+    record_count = models.IntegerField(default=0, verbose_name=_("Kayıt Sayısı"))
+    total_income = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Gelir")
+    )
+    total_expense = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Gider")
+    )
+    total_turnover = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Ciro")
+    )
+    computed_at = models.DateTimeField(verbose_name=_("Hesaplanma Zamanı"))
+
+    class Meta:
+        db_table = 'report_daily_aggregates'
+        verbose_name = _("Günlük Rapor Toplamı")
+        verbose_name_plural = _("Günlük Rapor Toplamları")
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'entity_id', 'date'],
+                name='unique_daily_aggregate'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.entity_id} - {self.date}"
+
+
+class MonthlyFinancialSummary(models.Model):
+    """
+    Şirket bazında aylık mali özet
+    generate_monthly_financial_summary task'ı tarafından doldurulur; dashboard bu tablodan okur.
+    """
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name='monthly_summaries',
+        verbose_name=_("Şirket")
+    )
+    period = models.DateField(verbose_name=_("Dönem"), help_text=_("Ayın ilk günü"))
+    record_count = models.IntegerField(default=0, verbose_name=_("Kayıt Sayısı"))
+    total_income = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Gelir")
+    )
+    total_expense = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Gider")
+    )
+    total_turnover = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Ciro")
+    )
+    total_profit_share = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Toplam Kar Payı")
+    )
+    net_profit = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Net Kar")
+    )
+    computed_at = models.DateTimeField(verbose_name=_("Hesaplanma Zamanı"))
+
+    class Meta:
+        db_table = 'monthly_financial_summaries'
+        verbose_name = _("Aylık Mali Özet")
+        verbose_name_plural = _("Aylık Mali Özetler")
+        ordering = ['-period', 'company']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'period'],
+                name='unique_monthly_financial_summary'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.company} - {self.period:%Y-%m}"
+
+
+class DocumentNumberCounter(models.Model):
+    """
+    Önek ve yıl bazında belge numarası sayacı (SZL-2024-0001, SNT-2024-0001)
+    Sayaç numarayı alan kayıtla aynı transaction'da artırılır (bkz. core/numbering.py).
+    """
+    prefix = models.CharField(max_length=10, verbose_name=_("Önek"))
+    year = models.PositiveIntegerField(verbose_name=_("Yıl"))
+    last_value = models.PositiveIntegerField(default=0, verbose_name=_("Son Değer"))
+
+    class Meta:
+        db_table = 'document_number_counters'
+        verbose_name = _("Belge Numarası Sayacı")
+        verbose_name_plural = _("Belge Numarası Sayaçları")
+        constraints = [
+            models.UniqueConstraint(
+                fields=['prefix', 'year'],
+                name='unique_document_number_counter'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.last_value}"
+
+
 class AuditLog(models.Model):
     """Denetim kayıtları modeli"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -0,0 +1,91 @@
+"""
+Bildirim özetleri (digest)
+
+Bir bildirim için gereken sayı, toplam ve ilk N kayıt şirket bazında tek
+bir sorguda window fonksiyonlarıyla hesaplanır. Özet her alıcıya ayrı bir
+mesaj olarak (alıcılar birbirini görmez) send_mass_mail ile gönderilir;
+NOTIFICATION_EMAIL_BATCH_SIZE mesaja kadar tek SMTP bağlantısı kullanılır.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mass_mail
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import RowNumber
+
+
+def get_staff_emails():
+    """Bildirim alacak yönetici e-postaları"""
+    return list(
+        User.objects.filter(is_staff=True, is_active=True)
+        .exclude(email='')
+        .values_list('email', flat=True)
+    )
+
+
+def build_company_digest(queryset, fields, order_by, sum_field=None, top_n=None):
+    """
+    Kayıtları şirket bazında özetle (tek sorgu)
+    Dönüş: {'count', 'total', 'companies': [{'company_id', 'company', 'count', 'total', 'items'}]}
+    items, şirket başına order_by sırasına göre ilk top_n kaydın `fields` değerleridir.
+    """
+    top_n = top_n or settings.NOTIFICATION_DIGEST_TOP_N
+    partition = [F('related_company_id')]
+
+    windows = {
+        'digest_rank': Window(RowNumber(), partition_by=partition, order_by=order_by),
+        'digest_count': Window(Count('pk'), partition_by=partition),
+    }
+    if sum_field:
+        windows['digest_total'] = Window(Sum(sum_field), partition_by=partition)
+
+    rows = (
+        queryset.order_by()
+        .annotate(**windows)
+        .filter(digest_rank__lte=top_n)
+        .values('related_company_id', 'related_company__title', *windows.keys(), *fields)
+        .order_by('related_company__title', 'related_company_id', 'digest_rank')
+    )
+
+    digest = {'count': 0, 'total': 0, 'companies': []}
+    current = None
+    for row in rows:
+        if current is None or current['company_id'] != row['related_company_id']:
+            current = {
+                'company_id': row['related_company_id'],
+                'company': row['related_company__title'] or '-',
+                'count': row['digest_count'],
+                'total': row.get('digest_total') or 0,
+                'items': [],
+            }
+            digest['companies'].append(current)
+            digest['count'] += current['count']
+            digest['total'] += current['total']
+        current['items'].append({field: row[field] for field in fields})
+
+    return digest
+
+
+def send_digest(subject, message, recipients=None):
+    """
+    Özeti her alıcıya ayrı mesaj olarak tek bağlantı üzerinden gönder
+    Dönüş: gönderilen mesaj sayısı
+    """
+    recipients = get_staff_emails() if recipients is None else recipients
+    messages = [
+        (subject, message, settings.DEFAULT_FROM_EMAIL, [recipient])
+        for recipient in recipients
+    ]
+    return send_messages_in_batches(messages)
+
+
+def send_messages_in_batches(messages, batch_size=None):
+    """
+    (subject, message, from_email, recipient_list) mesajlarını parçalar halinde
+    gönder; her parça tek bir SMTP bağlantısı kullanır. Dönüş: gönderilen mesaj sayısı
+    """
+    batch_size = batch_size or settings.NOTIFICATION_EMAIL_BATCH_SIZE
+    sent = 0
+    for index in range(0, len(messages), batch_size):
+        sent += send_mass_mail(messages[index:index + batch_size], fail_silently=True)
+    return sent
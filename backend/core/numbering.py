@@ -0,0 +1,72 @@
+"""
+Belge numarası üretimi
+
+SZL-{yıl}-NNNN / SNT-{yıl}-NNNN numaraları önek+yıl başına tek satırlık bir
+sayaçtan alınır. Sayaç atomik bir UPDATE ile artırılır; satır kilidi
+transaction sonuna kadar tutulduğundan eşzamanlı kayıtlar aynı numarayı
+alamaz. Numarayı alan kayıt oluşturulamazsa sayaç da geri alınır, böylece
+numaralarda boşluk oluşmaz. Toplu kayıtlar için tek seferde blok ayrılır.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Contract, DocumentNumberCounter, PromissoryNote
+
+
+CONTRACT_PREFIX = 'SZL'
+PROMISSORY_NOTE_PREFIX = 'SNT'
+
+# Önek -> (model, numara alanı); sayaç ilk kez oluşturulurken mevcut
+# numaraların devamından başlamak için kullanılır
+NUMBERED_FIELDS = {
+    CONTRACT_PREFIX: (Contract, 'contract_number'),
+    PROMISSORY_NOTE_PREFIX: (PromissoryNote, 'note_number'),
+}
+
+
+def format_number(prefix, year, value):
+    return f'{prefix}-{year}-{value:04d}'
+
+
+def _last_issued_value(prefix, year):
+    """Sayaç yokken verilmiş en büyük numara (yıl başına yalnızca bir kez çalışır)"""
+    model, field = NUMBERED_FIELDS[prefix]
+    start = f'{prefix}-{year}-'
+    last_value = 0
+    for number in model.objects.filter(**{f'{field}__startswith': start}).values_list(field, flat=True):
+        suffix = number[len(start):]
+        if suffix.isdigit():
+            last_value = max(last_value, int(suffix))
+    return last_value
+
+
+def allocate_numbers(prefix, count=1, year=None):
+    """
+    Önek için ardışık `count` adet numara ayır
+    Çağıran transaction'ın içinde kullanılmalıdır; numaralar o transaction
+    commit edilene kadar başka bir kayda verilemez.
+    """
+    year = year or timezone.now().year
+
+    with transaction.atomic():
+        counters = DocumentNumberCounter.objects.filter(prefix=prefix, year=year)
+        updated = counters.update(last_value=F('last_value') + count)
+        if not updated:
+            DocumentNumberCounter.objects.bulk_create(
+                [DocumentNumberCounter(
+                    prefix=prefix, year=year, last_value=_last_issued_value(prefix, year)
+                )],
+                ignore_conflicts=True,
+            )
+            counters.update(last_value=F('last_value') + count)
+
+        last_value = counters.values_list('last_value', flat=True).get()
+
+    return [format_number(prefix, year, value) for value in range(last_value - count + 1, last_value + 1)]
+
+
+def next_number(prefix, year=None):
+    """Önek için sıradaki numara"""
+    return allocate_numbers(prefix, 1, year)[0]
@@ -0,0 +1,195 @@
+"""
+DOCX -> PDF dönüştürme servisi
+
+LibreOffice'in soğuk açılışı saniyeler sürdüğünden her worker process'i
+sıcak tutulan unoserver (headless soffice) süreçlerinden oluşan bir havuz
+kullanır. İşler XML-RPC ile boştaki sürece gönderilir; zaman aşımına
+uğrayan, hata veren veya PDF_CONVERTER_MAX_JOBS dönüşüme ulaşan süreçler
+kapatılıp yenisiyle değiştirilir.
+
+Gereksinimler: LibreOffice + python3-uno ve sistem Python'u için unoserver
+(bkz. Dockerfile, INSTALL_PDF_CONVERTER build argümanı).
+"""
+
+import atexit
+import http.client
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import xmlrpc.client
+
+from django.conf import settings
+
+
+class ConversionError(Exception):
+    """PDF dönüştürme hatası"""
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class _TimeoutTransport(xmlrpc.client.Transport):
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class ConverterProcess:
+    """Tek bir sıcak unoserver/soffice süreci"""
+
+    def __init__(self):
+        self.port = _free_port()
+        self.uno_port = _free_port()
+        self.profile_dir = tempfile.mkdtemp(prefix='soffice-profile-')
+        self.jobs = 0
+
+        env = os.environ.copy()
+        if settings.PDF_CONVERTER_PYTHONPATH:
+            env['PYTHONPATH'] = settings.PDF_CONVERTER_PYTHONPATH
+
+        self.process = subprocess.Popen(
+            [
+                settings.PDF_CONVERTER_PYTHON, '-m', 'unoserver.server',
+                '--interface', '127.0.0.1',
+                '--port', str(self.port),
+                '--uno-port', str(self.uno_port),
+                '--user-installation', f'file://{self.profile_dir}',
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._wait_until_ready(settings.PDF_CONVERTER_STARTUP_TIMEOUT)
+
+    def _wait_until_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise ConversionError('PDF dönüştürücü başlatılamadı')
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def convert(self, docx_bytes, timeout):
+        proxy = xmlrpc.client.ServerProxy(
+            f'http://127.0.0.1:{self.port}',
+            transport=_TimeoutTransport(timeout),
+            allow_none=True,
+        )
+        result = proxy.convert(
+            None, xmlrpc.client.Binary(docx_bytes), None, 'pdf', None, [], True, None
+        )
+        self.jobs += 1
+        return result.data if isinstance(result, xmlrpc.client.Binary) else result
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class ConverterPool:
+    """Sıcak dönüştürücü süreçleri havuzu"""
+
+    def __init__(self, size):
+        self.size = size
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Havuz dolmadıysa yeni süreç başlat (tembel açılış)
+        with self._lock:
+            if self._started < self.size:
+                self._started += 1
+                try:
+                    return ConverterProcess()
+                except Exception:
+                    self._started -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise ConversionError('Boşta PDF dönüştürücü yok')
+
+    def _release(self, converter, healthy):
+        if healthy and converter.alive and converter.jobs < settings.PDF_CONVERTER_MAX_JOBS:
+            self._idle.put(converter)
+            return
+        # Süreci geri dönüştür
+        converter.stop()
+        with self._lock:
+            self._started -= 1
+
+    def convert(self, docx_bytes, timeout=None):
+        """DOCX içeriğini PDF içeriğine dönüştür"""
+        timeout = timeout or settings.PDF_CONVERTER_TIMEOUT
+        converter = self._acquire(timeout)
+        healthy = False
+        try:
+            pdf_bytes = converter.convert(docx_bytes, timeout)
+            healthy = True
+            return pdf_bytes
+        except (OSError, http.client.HTTPException, xmlrpc.client.Error) as exc:
+            raise ConversionError(f'PDF dönüştürme hatası: {exc}') from exc
+        finally:
+            self._release(converter, healthy)
+
+    def shutdown(self):
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_pid = None
+
+
+def get_converter_pool():
+    """Bu process'e ait dönüştürücü havuzu (fork sonrası yeniden oluşturulur)"""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ConverterPool(settings.PDF_CONVERTER_POOL_SIZE)
+        _pool_pid = os.getpid()
+        atexit.register(_pool.shutdown)
+    return _pool
+
+
+def convert_docx_to_pdf(docx_bytes):
+    """DOCX -> PDF; dönüştürücü kapalıysa None döner"""
+    if not settings.PDF_CONVERTER_ENABLED:
+        return None
+    return get_converter_pool().convert(docx_bytes)
@@ -0,0 +1,98 @@
+"""
+HTML/CSS tabanlı PDF raporları (WeasyPrint)
+
+Rapor içerikleri templates/reports altındaki Django şablonlarından üretilir.
+Ortak stil dosyası ve font yapılandırması process başına bir kez derlenip
+sonraki tüm render işlemlerinde yeniden kullanılır (gunicorn ve Celery
+worker'ları kalıcı process'lerdir).
+
+Rapor tek belge olarak render edilir; sayfa numaraları ve sayfa altı
+bilgisi tüm belge boyunca süreklidir. PDF_REPORT_SYNC_MAX_ROWS satıra
+kadar export istek içinde, daha büyükleri export_pdf_task ile Celery'de
+üretilir; PDF_REPORT_MAX_ROWS üstü reddedilir.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+
+REPORT_STYLESHEET = os.path.join(settings.BASE_DIR, 'templates', 'reports', 'report.css')
+
+_resources = None
+
+
+def _get_render_resources():
+    """(font yapılandırması, derlenmiş stil dosyası) - process başına bir kez"""
+    global _resources
+    if _resources is None:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        font_config = FontConfiguration()
+        stylesheet = CSS(filename=REPORT_STYLESHEET, font_config=font_config)
+        _resources = (font_config, stylesheet)
+    return _resources
+
+
+def render_html_to_pdf(html):
+    """HTML içeriğini önceden derlenmiş stil ve fontlarla PDF'e çevir"""
+    from weasyprint import HTML
+
+    font_config, stylesheet = _get_render_resources()
+    return HTML(string=html, base_url=str(settings.BASE_DIR)).write_pdf(
+        stylesheets=[stylesheet], font_config=font_config
+    )
+
+
+def render_report_pdf(template_name, context, rows):
+    """Şablonu tüm satırlarla tek belge olarak render et"""
+    return render_html_to_pdf(render_to_string(template_name, {
+        **context,
+        'rows': rows,
+        'generated_at': timezone.localtime().strftime('%d.%m.%Y %H:%M'),
+    }))
+
+
+def get_pdf_exports():
+    """export adı -> (model, export fonksiyonu); Celery task'ı ada göre çalışır"""
+    from .models import Company, FinancialRecord, Report
+    from .utils import export_companies_to_pdf, export_financial_records_to_pdf, export_reports_to_pdf
+
+    return {
+        'companies': (Company, export_companies_to_pdf),
+        'reports': (Report, export_reports_to_pdf),
+        'financial_records': (FinancialRecord, export_financial_records_to_pdf),
+    }
+
+
+def export_ordering(queryset):
+    """Queryset sıralamasının Celery'ye taşınabilen kısmı (yalnızca model alanları)"""
+    model = queryset.model
+    ordering = []
+    for item in queryset.query.order_by or model._meta.ordering:
+        if not isinstance(item, str):
+            continue
+        try:
+            model._meta.get_field(item.lstrip('-').split('__')[0])
+        except FieldDoesNotExist:
+            continue
+        ordering.append(item)
+    return ordering
+
+
+def save_report_pdf(prefix, template_name, context, rows):
+    """Raporu exports klasörüne kaydet ve dosya URL'ini döndür"""
+    from .utils import generate_unique_filename
+
+    filename = generate_unique_filename(prefix, 'pdf')
+    filepath = os.path.join(settings.MEDIA_ROOT, 'exports', filename)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    with open(filepath, 'wb') as f:
+        f.write(render_report_pdf(template_name, context, rows))
+
+    return f"{settings.MEDIA_URL}exports/{filename}"
@@ -0,0 +1,161 @@
+"""
+Celery task ilerleme bilgisi
+
+Uzun süren task'lar report_progress ile PROGRESS durumunu ve ilerleme
+meta verisini result backend'e yazar. Redis result backend her durum
+değişikliğini task anahtarının kanalına da yayınladığından, SSE endpoint'i
+istemci başına tek bir bağlantı açık tutarak bu değişiklikleri iletir.
+
+Uzun açık bağlantı sync gunicorn worker'ını kilitler. Bu yüzden akış süresi
+TASK_EVENTS_STREAM_TIMEOUT ile belirlenir: 0 ise (varsayılan) her istek anlık
+durumu gönderip kapanır ve EventSource TASK_EVENTS_RETRY_MS sonra yeniden
+bağlanır (yoklama). Uzun akış yalnızca gevent worker'lı events servisinde
+açılır (bkz. docker-compose.yml web-events).
+
+Task durumunu yalnızca task'ı başlatan (veya paylaşılan rapor üretimine
+katılan) kullanıcı görebilir (grant_task_access). EventSource Authorization
+başlığı gönderemediğinden events endpoint'i, task'a ve kullanıcıya bağlı
+kısa ömürlü bir ?token= ile de açılabilir.
+"""
+
+import json
+import time
+
+from celery import states
+from celery.result import AsyncResult
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from config.celery import app
+
+
+PROGRESS = 'PROGRESS'
+
+# Açık akışta keep-alive aralığı (sn)
+EVENT_STREAM_KEEPALIVE = 15
+
+EVENT_STREAM_TOKEN_SALT = 'core.progress.events'
+
+
+def task_access_cache_key(task_id, user_id):
+    return f'task-access:{task_id}:{user_id}'
+
+
+def grant_task_access(task_id, user):
+    """Kullanıcının task durumunu izlemesine izin ver"""
+    cache.set(task_access_cache_key(task_id, user.pk), True, settings.TASK_ACCESS_TIMEOUT)
+
+
+def has_task_access(task_id, user):
+    if user.is_superuser:
+        return True
+    return bool(cache.get(task_access_cache_key(task_id, user.pk)))
+
+
+def make_event_stream_token(task_id, user):
+    """Yalnızca bu task'ın events endpoint'i için geçerli imzalı token"""
+    return signing.dumps({'task': str(task_id), 'user': user.pk}, salt=EVENT_STREAM_TOKEN_SALT)
+
+
+class EventStreamTokenAuthentication(BaseAuthentication):
+    """
+    ?token= ile kimlik doğrulama (EventSource başlık gönderemez)
+    request.auth token içeriğidir; view task eşleşmesini kontrol eder
+    """
+
+    def authenticate(self, request):
+        token = request.query_params.get('token')
+        if not token:
+            return None
+        try:
+            payload = signing.loads(
+                token, salt=EVENT_STREAM_TOKEN_SALT, max_age=settings.TASK_EVENTS_TOKEN_MAX_AGE
+            )
+        except signing.BadSignature:
+            raise AuthenticationFailed('Geçersiz veya süresi dolmuş token')
+
+        user = User.objects.filter(pk=payload['user'], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed('Kullanıcı bulunamadı')
+        return user, payload
+
+
+def report_progress(task, current, total, message=''):
+    """Task içinden ilerleme bilgisini yayınla"""
+    if not task.request.id or task.request.called_directly:
+        return
+    task.update_state(state=PROGRESS, meta={
+        'current': current,
+        'total': total,
+        'percent': int(current * 100 / total) if total else 100,
+        'message': message,
+    })
+
+
+def task_status(task_id):
+    """Task durumunu API çıktısına dönüştür"""
+    result = AsyncResult(task_id, app=app)
+    payload = {'task_id': task_id, 'status': result.state, 'progress': None, 'result': None}
+
+    if result.state == PROGRESS:
+        payload['progress'] = result.info
+    elif result.state == states.SUCCESS:
+        payload['result'] = result.result
+    elif result.state in states.PROPAGATE_STATES:
+        payload['result'] = {'error': str(result.result)}
+
+    return payload
+
+
+def _format_event(payload, event='status'):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def stream_task_events(task_id, timeout=None):
+    """
+    Task durum değişikliklerini Server-Sent Events olarak üret
+    Redis backend'de task anahtarının pub/sub kanalı dinlenir; diğer
+    backend'lerde sunucu tarafında saniyede bir okuma yapılır.
+    """
+    if timeout is None:
+        timeout = settings.TASK_EVENTS_STREAM_TIMEOUT
+    backend = app.backend
+    deadline = time.monotonic() + timeout
+
+    pubsub = None
+    client = getattr(backend, 'client', None)
+    if timeout > 0 and client is not None and hasattr(client, 'pubsub'):
+        # İlk okumadan önce abone ol, aradaki değişiklik kaçmasın
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(backend.get_key_for_task(task_id))
+
+    try:
+        # Bağlantı kapanınca EventSource bu süre sonra yeniden bağlanır
+        yield f"retry: {settings.TASK_EVENTS_RETRY_MS}\n\n"
+        payload = task_status(task_id)
+        yield _format_event(payload)
+
+        if timeout > 0 and not connection.in_atomic_block:
+            # Akış boyunca veritabanı bağlantısı tutulmasın
+            connection.close()
+
+        while payload['status'] not in states.READY_STATES and time.monotonic() < deadline:
+            if pubsub is not None:
+                if pubsub.get_message(timeout=EVENT_STREAM_KEEPALIVE) is None:
+                    yield ": keep-alive\n\n"
+                    continue
+            else:
+                time.sleep(1)
+
+            current = task_status(task_id)
+            if current != payload:
+                payload = current
+                yield _format_event(payload)
+    finally:
+        if pubsub is not None:
+            pubsub.close()
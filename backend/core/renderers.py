@@ -0,0 +1,62 @@
+import json
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    text/event-stream renderer
+    Akışın kendisi StreamingHttpResponse ile döner; bu renderer içerik
+    anlaşmasının (Accept: text/event-stream) ve hata yanıtlarının işlenmesi içindir.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return f"event: error\ndata: {json.dumps(data, default=str)}\n\n".encode(self.charset)
+
+
+# orjson'un doğrudan desteklemediği tipler (Decimal, timedelta, lazy çeviri
+# metinleri, QuerySet...) DRF'in encoder'ı ile aynı şekilde dönüştürülür
+_drf_default = JSONEncoder().default
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson ile JSON renderer
+    Çıktı DRF'in JSONRenderer'ıyla aynıdır (kompakt, UTF-8, UTC zamanlar 'Z'
+    ile, UUID metin, Decimal sayı); girintili çıktı (tarayıcıdan gezilebilir
+    API) istenirse DRF'in renderer'ına düşer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        # DRF gibi: JavaScript'te satır sonu sayılan karakterleri kaçışla
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """orjson ile JSON parser (istek gövdesi UTF-8 olmalıdır)"""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
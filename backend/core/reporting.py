@@ -0,0 +1,207 @@
+"""
+Artımlı rapor toplamları
+
+Her scope/entity için günlük kısmi toplamlar report_daily_aggregates
+tablosunda saklanır. Dönem raporları bu satırlardan oluşturulur ve yalnızca
+son hesaplamadan sonra değişen günler ham kayıtlardan yeniden hesaplanır.
+
+Haftalık, aylık ve yıllık dönemler açık uçludur (date >= başlangıç):
+ileri tarihli kayıtlar da rapora girer. Günlük toplamlar bugüne kadar
+saklanır; bugünden sonraki kayıtlar her seferinde ham kayıtlardan toplanır.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from .db_router import replica_reads
+from .models import FinancialRecord, ReportDailyAggregate
+
+
+# Rapor türü -> geriye dönük gün sayısı
+PERIOD_DAYS = {
+    'daily': 0,
+    'weekly': 7,
+    'monthly': 30,
+    'yearly': 365,
+}
+
+SCOPES = ('company', 'brand', 'branch', 'person')
+
+AGGREGATE_FIELDS = ('record_count', 'total_income', 'total_expense', 'total_turnover')
+
+# Aynı anahtar için devam eden üretim task'ının tutulduğu cache süresi (sn)
+REPORT_TASK_LOCK_TIMEOUT = 60 * 30
+
+
+def get_report_period(report_type, today=None):
+    """
+    Rapor türüne göre (başlangıç, bitiş) tarihleri; özel raporlarda (None, None)
+    Günlük rapor yalnızca bugünü kapsar; diğerlerinde bitiş None'dır (açık uçlu).
+    """
+    days = PERIOD_DAYS.get(report_type)
+    if days is None:
+        return None, None
+    today = today or timezone.now().date()
+    if report_type == 'daily':
+        return today, today
+    return today - timedelta(days=days), None
+
+
+def filter_period(records, start, end):
+    """Mali kayıtları dönemle sınırla; end None ise başlangıçtan itibaren tümü"""
+    if start is None:
+        return records
+    if end is None:
+        return records.filter(date__gte=start)
+    return records.filter(date__range=(start, end))
+
+
+def _total_expressions():
+    return {
+        'record_count': Count('id'),
+        'total_income': Sum('amount', filter=Q(type='income')),
+        'total_expense': Sum('amount', filter=Q(type='expense')),
+        'total_turnover': Sum('amount', filter=Q(type='turnover')),
+    }
+
+
+def _daily_totals(records):
+    """Kayıtları güne göre grupla (tek sorgu)"""
+    return records.order_by().values('date').annotate(**_total_expressions())
+
+
+def refresh_daily_aggregates(scope, entity_id, start, end):
+    """
+    [start, end] aralığında eksik veya değişmiş günlerin toplamlarını yeniden hesapla
+    Dönüş: yeniden hesaplanan gün sayısı
+    """
+    records = FinancialRecord.objects.filter(
+        **{f'related_{scope}_id': entity_id},
+        date__range=(start, end)
+    )
+    computed = dict(
+        ReportDailyAggregate.objects.filter(
+            scope=scope, entity_id=entity_id, date__range=(start, end)
+        ).values_list('date', 'computed_at')
+    )
+
+    days = {start + timedelta(days=offset) for offset in range((end - start).days + 1)}
+    dirty = days - computed.keys()
+
+    if computed:
+        # Son hesaplamadan sonra güncellenen kayıtların günleri (updated_at index'i)
+        changed = records.filter(updated_at__gt=min(computed.values())).order_by().values(
+            'date'
+        ).annotate(last_update=Max('updated_at'))
+        for row in changed:
+            if row['date'] in computed and row['last_update'] > computed[row['date']]:
+                dirty.add(row['date'])
+
+    if not dirty:
+        return 0
+
+    # Hesaplama sırasında gelen yazmalar bir sonraki çalıştırmada yakalansın
+    computed_at = timezone.now()
+    totals = {row['date']: row for row in _daily_totals(records.filter(date__in=dirty))}
+
+    ReportDailyAggregate.objects.bulk_create(
+        [
+            ReportDailyAggregate(
+                scope=scope,
+                entity_id=entity_id,
+                date=day,
+                computed_at=computed_at,
+                **{
+                    field: totals.get(day, {}).get(field) or 0
+                    for field in AGGREGATE_FIELDS
+                }
+            )
+            for day in dirty
+        ],
+        update_conflicts=True,
+        unique_fields=['scope', 'entity_id', 'date'],
+        update_fields=list(AGGREGATE_FIELDS) + ['computed_at'],
+    )
+
+    return len(dirty)
+
+
+def get_period_statistics(scope, entity_id, start, end):
+    """
+    Dönem istatistiklerini günlük toplamlardan oluştur
+    Toplamlar birincil veritabanında yenilenip aynı yerden okunur: replika
+    gecikmesi değişen günleri kaçırmasın ve yeni yazılan toplamlar görünsün.
+    end None ise bugünden sonraki kayıtlar ham kayıtlardan eklenir.
+    """
+    today = timezone.now().date()
+    stored_end = min(end or today, today)
+
+    with replica_reads(False):
+        totals = {field: 0 for field in AGGREGATE_FIELDS}
+        if start <= stored_end:
+            refresh_daily_aggregates(scope, entity_id, start, stored_end)
+            stored = ReportDailyAggregate.objects.filter(
+                scope=scope, entity_id=entity_id, date__range=(start, stored_end)
+            ).aggregate(**{field: Sum(field) for field in AGGREGATE_FIELDS})
+            for field in AGGREGATE_FIELDS:
+                totals[field] += stored[field] or 0
+
+        if end is None:
+            future = FinancialRecord.objects.filter(
+                **{f'related_{scope}_id': entity_id}, date__gt=today
+            ).order_by().aggregate(**_total_expressions())
+            for field in AGGREGATE_FIELDS:
+                totals[field] += future[field] or 0
+
+    return {
+        'total_records': totals['record_count'],
+        'total_income': totals['total_income'],
+        'total_expense': totals['total_expense'],
+        'total_turnover': totals['total_turnover'],
+    }
+
+
+def invalidate_daily_aggregates(record_date, entity_ids):
+    """
+    Bir kaydın etkilediği günlük toplamları sil
+    entity_ids: {'company': <uuid>, 'brand': <uuid>, ...}
+    """
+    condition = Q()
+    for scope, entity_id in entity_ids.items():
+        if entity_id:
+            condition |= Q(scope=scope, entity_id=entity_id)
+
+    if condition:
+        ReportDailyAggregate.objects.filter(condition, date=record_date).delete()
+
+
+def record_entity_ids(record):
+    """Mali kaydın scope -> entity id eşlemesi"""
+    return {scope: getattr(record, f'related_{scope}_id') for scope in SCOPES}
+
+
+def report_generation_key(scope, entity_id, report_type, today=None):
+    """
+    Rapor üretim anahtarı: scope/entity/tür/dönem + veri filigranı
+    Filigran, dönemdeki kayıtların en son updated_at değeri ve sayısıdır;
+    veri değişmediği sürece aynı anahtar üretilir.
+    """
+    start, end = get_report_period(report_type, today)
+    records = filter_period(FinancialRecord.objects.filter(**{f'related_{scope}_id': entity_id}), start, end)
+
+    watermark = records.order_by().aggregate(last_update=Max('updated_at'), total=Count('id'))
+    last_update = watermark['last_update'].isoformat() if watermark['last_update'] else '-'
+
+    return ':'.join([
+        scope,
+        str(entity_id),
+        report_type,
+        f"{start or '-'}..{end or '-'}",
+        f"{last_update}/{watermark['total']}",
+    ])
+
+
+def report_task_cache_key(generation_key):
+    return f'report-task:{generation_key}'
@@ -2,10 +2,15 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import (
     Company, Brand, Branch, Person, Role, Report,
-    Contract, PromissoryNote, FinancialRecord, AuditLog
+    Contract, PromissoryNote, FinancialRecord, AuditLog, MonthlyFinancialSummary,
+    is_contract_active, is_note_overdue, mask_national_id
 )
+from django.db import transaction
 from django.utils import timezone
 
+from .numbering import CONTRACT_PREFIX, PROMISSORY_NOTE_PREFIX, next_number
+from .sparse_fields import SparseFieldsSerializerMixin
+
 
 # ============================================
 # USER SERIALIZERS
@@ -241,8 +246,13 @@ class PersonListSerializer(serializers.ModelSerializer):
                   'role_name', 'branch_name', 'company_name', 'is_active', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    # values() hızlı yolu için (bkz. core/fast_serialization.py)
+    values_computed = {
+        'masked_national_id': (('national_id',), mask_national_id),
+    }
+
 
-class PersonDetailSerializer(serializers.ModelSerializer):
+class PersonDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Kişi detay serializer"""
     role = RoleSerializer(read_only=True)
     role_id = serializers.UUIDField(write_only=True)
@@ -264,18 +274,30 @@ class PersonDetailSerializer(serializers.ModelSerializer):
                   'is_active', 'contracts_count', 'promissory_notes_count',
                   'financial_records_count', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['role', 'branch']
+        field_dependencies = {
+            'masked_national_id': ['national_id'],
+            'masked_iban': ['iban'],
+        }
         extra_kwargs = {
             'national_id': {'write_only': True},
             'iban': {'write_only': True},
         }
 
+    # Sayılar, alan istendiyse PersonViewSet'te annotation olarak eklenir
     def get_contracts_count(self, obj):
+        if hasattr(obj, 'contracts_count'):
+            return obj.contracts_count
         return obj.contracts.count()
 
     def get_promissory_notes_count(self, obj):
+        if hasattr(obj, 'promissory_notes_count'):
+            return obj.promissory_notes_count
         return obj.promissory_notes.count()
 
     def get_financial_records_count(self, obj):
+        if hasattr(obj, 'financial_records_count'):
+            return obj.financial_records_count
         return obj.financial_records.count()
 
     def create(self, validated_data):
@@ -325,8 +347,18 @@ class ReportListSerializer(serializers.ModelSerializer):
                   'created_by_name', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    # values() hızlı yolu için (bkz. core/fast_serialization.py); oluşturan
+    # kullanıcı yoksa alan, DRF'te olduğu gibi çıktıdan çıkar
+    values_computed = {
+        'created_by_name': (
+            ('created_by__first_name', 'created_by__last_name'),
+            lambda first_name, last_name: f'{first_name} {last_name}'.strip(),
+            ('created_by_id',),
+        ),
+    }
 
-class ReportDetailSerializer(serializers.ModelSerializer):
+
+class ReportDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Rapor detay serializer"""
     created_by = UserSerializer(read_only=True)
     company = CompanyListSerializer(read_only=True)
@@ -347,6 +379,7 @@ class ReportDetailSerializer(serializers.ModelSerializer):
                   'branch', 'branch_id', 'person', 'person_id', 'tags',
                   'metadata', 'created_by', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['created_by', 'company', 'brand', 'branch', 'person']
 
     def validate(self, data):
         """Scope'a göre ilişki doğrulama"""
@@ -384,6 +417,19 @@ class ReportDetailSerializer(serializers.ModelSerializer):
 # CONTRACT SERIALIZERS
 # ============================================
 
+def describe_related_entity(person_name=None, branch_name=None, brand_name=None, company_title=None):
+    """Liste serializer'larındaki related_entity metni (en özel ilişki önce)"""
+    if person_name is not None:
+        return f"Kişi: {person_name}"
+    elif branch_name is not None:
+        return f"Şube: {branch_name}"
+    elif brand_name is not None:
+        return f"Marka: {brand_name}"
+    elif company_title is not None:
+        return f"Şirket: {company_title}"
+    return "Belirtilmemiş"
+
+
 class ContractListSerializer(serializers.ModelSerializer):
     """Sözleşme liste serializer"""
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -397,20 +443,27 @@ class ContractListSerializer(serializers.ModelSerializer):
                   'created_at']
         read_only_fields = ['id', 'created_at']
 
+    # values() hızlı yolu için (bkz. core/fast_serialization.py)
+    values_computed = {
+        'is_active': (('status', 'end_date'), is_contract_active),
+        'related_entity': (
+            ('related_person__full_name', 'related_branch__name',
+             'related_brand__name', 'related_company__title'),
+            describe_related_entity,
+        ),
+    }
+
     def get_related_entity(self, obj):
         """İlgili entity bilgisi"""
-        if obj.related_person:
-            return f"Kişi: {obj.related_person.full_name}"
-        elif obj.related_branch:
-            return f"Şube: {obj.related_branch.name}"
-        elif obj.related_brand:
-            return f"Marka: {obj.related_brand.name}"
-        elif obj.related_company:
-            return f"Şirket: {obj.related_company.title}"
-        return "Belirtilmemiş"
-
-
-class ContractDetailSerializer(serializers.ModelSerializer):
+        return describe_related_entity(
+            obj.related_person.full_name if obj.related_person else None,
+            obj.related_branch.name if obj.related_branch else None,
+            obj.related_brand.name if obj.related_brand else None,
+            obj.related_company.title if obj.related_company else None,
+        )
+
+
+class ContractDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Sözleşme detay serializer"""
     created_by = UserSerializer(read_only=True)
     related_company = CompanyListSerializer(read_only=True)
@@ -434,6 +487,8 @@ class ContractDetailSerializer(serializers.ModelSerializer):
                   'end_date', 'status', 'is_active', 'versioning', 'created_by',
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['created_by', 'related_company', 'related_brand', 'related_branch', 'related_person']
+        field_dependencies = {'is_active': ['status', 'end_date']}
 
     def create(self, validated_data):
         # ID'lerden nesneleri çöz
@@ -450,14 +505,17 @@ class ContractDetailSerializer(serializers.ModelSerializer):
         if request and hasattr(request, 'user'):
             validated_data['created_by'] = request.user
         
-        # Otomatik contract_number oluştur
-        if not validated_data.get('contract_number'):
-            from datetime import datetime
-            year = datetime.now().year
-            count = Contract.objects.filter(contract_number__startswith=f'SZL-{year}').count()
-            validated_data['contract_number'] = f'SZL-{year}-{count+1:04d}'
-        
-        return super().create(validated_data)
+        # Otomatik contract_number oluştur; numara kayıtla aynı transaction'da
+        # ayrılır, kayıt oluşmazsa sayaç da geri alınır
+        with transaction.atomic():
+            if not validated_data.get('contract_number'):
+                validated_data['contract_number'] = next_number(CONTRACT_PREFIX)
+            return super().create(validated_data)
+
+
+class ContractBatchGenerateSerializer(serializers.Serializer):
+    """Toplu sözleşme belgesi isteği (ids verilmezse liste filtreleri kullanılır)"""
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=True)
 
 
 # ============================================
@@ -477,15 +535,20 @@ class PromissoryNoteListSerializer(serializers.ModelSerializer):
                   'related_entity', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    # values() hızlı yolu için (bkz. core/fast_serialization.py)
+    values_computed = {
+        'is_overdue': (('payment_status', 'due_date'), is_note_overdue),
+        'related_entity': (('related_person__full_name', 'related_branch__name'), describe_related_entity),
+    }
+
     def get_related_entity(self, obj):
-        if obj.related_person:
-            return f"Kişi: {obj.related_person.full_name}"
-        elif obj.related_branch:
-            return f"Şube: {obj.related_branch.name}"
-        return "Belirtilmemiş"
+        return describe_related_entity(
+            obj.related_person.full_name if obj.related_person else None,
+            obj.related_branch.name if obj.related_branch else None,
+        )
 
 
-class PromissoryNoteDetailSerializer(serializers.ModelSerializer):
+class PromissoryNoteDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Senet detay serializer"""
     created_by = UserSerializer(read_only=True)
     related_company = CompanyListSerializer(read_only=True)
@@ -508,6 +571,8 @@ class PromissoryNoteDetailSerializer(serializers.ModelSerializer):
                   'related_branch_id', 'related_person', 'related_person_id',
                   'metadata', 'created_by', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['created_by', 'related_company', 'related_brand', 'related_branch', 'related_person']
+        field_dependencies = {'is_overdue': ['due_date', 'payment_status']}
 
     def create(self, validated_data):
         # ID'lerden nesneleri çöz
@@ -524,14 +589,12 @@ class PromissoryNoteDetailSerializer(serializers.ModelSerializer):
         if request and hasattr(request, 'user'):
             validated_data['created_by'] = request.user
         
-        # Otomatik note_number oluştur
-        if not validated_data.get('note_number'):
-            from datetime import datetime
-            year = datetime.now().year
-            count = PromissoryNote.objects.filter(note_number__startswith=f'SNT-{year}').count()
-            validated_data['note_number'] = f'SNT-{year}-{count+1:04d}'
-        
-        return super().create(validated_data)
+        # Otomatik note_number oluştur; numara kayıtla aynı transaction'da
+        # ayrılır, kayıt oluşmazsa sayaç da geri alınır
+        with transaction.atomic():
+            if not validated_data.get('note_number'):
+                validated_data['note_number'] = next_number(PROMISSORY_NOTE_PREFIX)
+            return super().create(validated_data)
 
 
 # ============================================
@@ -550,7 +613,7 @@ class FinancialRecordListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class FinancialRecordDetailSerializer(serializers.ModelSerializer):
+class FinancialRecordDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Mali kayıt detay serializer"""
     created_by = UserSerializer(read_only=True)
     related_company = CompanyListSerializer(read_only=True)
@@ -572,6 +635,7 @@ class FinancialRecordDetailSerializer(serializers.ModelSerializer):
                   'related_branch_id', 'related_person', 'related_person_id',
                   'attachments', 'metadata', 'created_by', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['created_by', 'related_company', 'related_brand', 'related_branch', 'related_person']
 
     def create(self, validated_data):
         # ID'lerden nesneleri çöz
@@ -622,4 +686,15 @@ class DashboardStatsSerializer(serializers.Serializer):
     financial_records_count = serializers.IntegerField()
     recent_companies = CompanyListSerializer(many=True)
     recent_reports = ReportListSerializer(many=True)
-    overdue_notes = PromissoryNoteListSerializer(many=True)
\ No newline at end of file
+    overdue_notes = PromissoryNoteListSerializer(many=True)
+
+
+class MonthlyFinancialSummarySerializer(serializers.ModelSerializer):
+    """Aylık mali özet"""
+    company_title = serializers.CharField(source='company.title', read_only=True)
+
+    class Meta:
+        model = MonthlyFinancialSummary
+        fields = ['id', 'company', 'company_title', 'period', 'record_count',
+                  'total_income', 'total_expense', 'total_turnover',
+                  'total_profit_share', 'net_profit', 'computed_at']
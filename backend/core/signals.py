@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
@@ -5,9 +6,17 @@ from .models import (
     Brand, Branch, Person, Company, Report, Contract, 
     PromissoryNote, FinancialRecord, AuditLog
 )
+from .audit import trigger_mode_enabled
+from .reporting import invalidate_daily_aggregates, record_entity_ids
+from .lifecycle import status_transitioned
+from .list_cache import LIST_CACHE_MODELS, bump_generation
 import json
 
 
+# AUDIT_CAPTURE_MODE='triggers' iken denetim kayıtlarını veritabanı trigger'ları
+# yazar (bkz. core/audit.py); aşağıdaki log_* sinyalleri devre dışı kalır.
+
+
 @receiver([post_save, post_delete], sender=Branch)
 def update_brand_branch_count(sender, instance, **kwargs):
     """Şube eklendiğinde/silindiğinde marka şube sayısını güncelle"""
@@ -18,6 +27,8 @@ def update_brand_branch_count(sender, instance, **kwargs):
 @receiver(post_save, sender=Company)
 def log_company_changes(sender, instance, created, **kwargs):
     """Şirket değişikliklerini logla"""
+    if trigger_mode_enabled():
+        return
     if created:
         AuditLog.objects.create(
             action='create',
@@ -30,6 +41,8 @@ def log_company_changes(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Brand)
 def log_brand_changes(sender, instance, created, **kwargs):
     """Marka değişikliklerini logla"""
+    if trigger_mode_enabled():
+        return
     if created:
         AuditLog.objects.create(
             action='create',
@@ -42,6 +55,8 @@ def log_brand_changes(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Branch)
 def log_branch_changes(sender, instance, created, **kwargs):
     """Şube değişikliklerini logla"""
+    if trigger_mode_enabled():
+        return
     if created:
         AuditLog.objects.create(
             action='create',
@@ -54,6 +69,8 @@ def log_branch_changes(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Person)
 def log_person_changes(sender, instance, created, **kwargs):
     """Kişi değişikliklerini logla"""
+    if trigger_mode_enabled():
+        return
     if created:
         AuditLog.objects.create(
             action='create',
@@ -70,6 +87,8 @@ def log_person_changes(sender, instance, created, **kwargs):
 @receiver(post_delete, sender=Company)
 def log_company_deletion(sender, instance, **kwargs):
     """Şirket silinmesini logla"""
+    if trigger_mode_enabled():
+        return
     AuditLog.objects.create(
         action='delete',
         object_type='Company',
@@ -81,9 +100,41 @@ def log_company_deletion(sender, instance, **kwargs):
 @receiver(post_delete, sender=Brand)
 def log_brand_deletion(sender, instance, **kwargs):
     """Marka silinmesini logla"""
+    if trigger_mode_enabled():
+        return
     AuditLog.objects.create(
         action='delete',
         object_type='Brand',
         object_id=str(instance.id),
         changes={'name': instance.name}
     )
+
+
+@receiver(pre_save, sender=FinancialRecord)
+def invalidate_moved_record_aggregates(sender, instance, **kwargs):
+    """Tarihi veya ilişkisi değişen kaydın eski gününe ait rapor toplamlarını geçersiz kıl"""
+    if instance._state.adding:
+        return
+    previous = FinancialRecord.objects.filter(pk=instance.pk).first()
+    if previous is None:
+        return
+    if previous.date != instance.date or record_entity_ids(previous) != record_entity_ids(instance):
+        invalidate_daily_aggregates(previous.date, record_entity_ids(previous))
+
+
+@receiver(post_delete, sender=FinancialRecord)
+def invalidate_deleted_record_aggregates(sender, instance, **kwargs):
+    """Silinen kaydın gününe ait rapor toplamlarını geçersiz kıl"""
+    invalidate_daily_aggregates(instance.date, record_entity_ids(instance))
+
+
+def invalidate_list_cache(sender, **kwargs):
+    """Model değiştiğinde liste önbelleğini commit sonrasında geçersiz kıl"""
+    transaction.on_commit(lambda: bump_generation(sender))
+
+
+for model in LIST_CACHE_MODELS:
+    post_save.connect(invalidate_list_cache, sender=model)
+    post_delete.connect(invalidate_list_cache, sender=model)
+# Toplu durum geçişleri (queryset.update) save sinyali göndermez
+status_transitioned.connect(invalidate_list_cache)
@@ -0,0 +1,154 @@
+"""
+Seyrek alan seçimi (?fields= / ?expand=)
+
+GET isteklerinde ?fields=id,title yalnızca istenen alanları döndürür.
+Serializer Meta.expandable_fields'taki iç içe ilişkiler ?expand=company,brand
+ile tam nesne olarak açılır; fields veya expand verildiğinde açılmayan
+ilişkiler yalnızca id olarak döner. Parametre verilmezse yanıt değişmez.
+
+SparseFieldsViewSetMixin, retrieve sorgusunu seçime göre daraltır:
+kullanılmayan select_related / prefetch_related kaldırılır, only() ile
+yalnızca gereken sütunlar okunur ve sparse_annotations'taki ifadeler
+yalnızca ilgili alan istendiğinde eklenir.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _parse_list_param(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def get_sparse_fields(request):
+    """
+    İstekteki alan seçimi: (fields, expand)
+    fields None ise tüm alanlar; hiçbir parametre yoksa (None, None)
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None, None
+    fields = _parse_list_param(request, FIELDS_PARAM)
+    expand = _parse_list_param(request, EXPAND_PARAM)
+    if fields is None and expand is None:
+        return None, None
+    return fields, expand or set()
+
+
+def related_count(model, field):
+    """Satır başına ilişkili kayıt sayısı (join çoğaltması olmayan alt sorgu)"""
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class SparseFieldsSerializerMixin:
+    """
+    ?fields= / ?expand= desteği
+    Meta.expandable_fields: açılabilen iç içe ilişkiler
+    Meta.field_dependencies: model alanı olmayan (property) alanların okuduğu sütunlar
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, expand = get_sparse_fields(self.context.get('request'))
+        if fields is None and expand is None:
+            return
+
+        if fields is not None:
+            allowed = fields | expand
+            for name in list(self.fields):
+                if name not in allowed:
+                    self.fields.pop(name)
+
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name in self.fields and name not in expand:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
+def _select_related_paths(tree, prefix=''):
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        yield path
+        yield from _select_related_paths(children, f'{path}__')
+
+
+class SparseFieldsViewSetMixin:
+    """
+    retrieve sorgusunu serializer'da kalan alanlara göre daraltır
+    sparse_annotations: {alan adı: ifade üreten fonksiyon}
+    """
+    sparse_annotations = {}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'retrieve':
+            queryset = self.trim_queryset(queryset)
+        return queryset
+
+    def trim_queryset(self, queryset):
+        serializer = self.get_serializer()
+        fields = {name: field for name, field in serializer.fields.items() if not field.write_only}
+
+        annotations = {
+            name: factory() for name, factory in self.sparse_annotations.items() if name in fields
+        }
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+
+        model = queryset.model
+        meta = getattr(serializer, 'Meta', None)
+        dependencies = getattr(meta, 'field_dependencies', {})
+        columns, relations = {model._meta.pk.name}, set()
+        for name, field in fields.items():
+            if name in annotations:
+                continue
+            if name in dependencies:
+                columns.update(dependencies[name])
+                continue
+            if not field.source_attrs:
+                # source='*' (ör. SerializerMethodField): neyi okuduğu bilinmiyor
+                return queryset
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return queryset
+            if not model_field.concrete:
+                return queryset
+            columns.add(model_field.name)
+            # PrimaryKeyRelatedField yalnızca FK sütununu okur
+            if model_field.is_relation and not isinstance(field, serializers.PrimaryKeyRelatedField):
+                relations.add(model_field.name)
+
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            kept = [
+                path for path in _select_related_paths(select_related)
+                if path.split('__')[0] in relations
+            ]
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+
+        prefetches = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, 'prefetch_through', lookup).split('__')[0] in relations
+        ]
+        queryset = queryset.prefetch_related(None)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+
+        return queryset.only(*columns)
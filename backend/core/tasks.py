@@ -1,11 +1,14 @@
 from celery import shared_task
+from celery.utils.log import get_task_logger
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.core.cache import cache
 from django.conf import settings
 from django.utils import timezone
 from datetime import datetime, timedelta
 from decimal import Decimal
+from collections import deque
 import pandas as pd
+import math
 import os
 
 from .models import (
@@ -18,12 +21,22 @@ from .utils import (
     export_financial_records_to_pdf,
     generate_contract_from_template
 )
+from .pdf_conversion import ConversionError, convert_docx_to_pdf
+from .db_router import replica_reads
+from .progress import report_progress
+from .reporting import (
+    SCOPES, filter_period, get_report_period, get_period_statistics, report_task_cache_key
+)
+
+logger = get_task_logger(__name__)
 
 
 @shared_task(bind=True, max_retries=3)
-def generate_report_task(self, user_id, scope, report_type, entity_id, **kwargs):
+def generate_report_task(self, user_id, scope, report_type, entity_id, generation_key=None, **kwargs):
     """
     Ağır rapor oluşturma task'ı
+    generation_key verilirse rapor metadata'sına yazılır ve task bittiğinde
+    devam eden üretim kilidi (bkz. ReportViewSet.generate) kaldırılır.
     """
     try:
         user = User.objects.get(id=user_id)
@@ -39,12 +52,18 @@ def generate_report_task(self, user_id, scope, report_type, entity_id, **kwargs)
         elif scope == 'person':
             entity = Person.objects.get(id=entity_id)
         
-        # Rapor verilerini topla
-        report_data = collect_report_data(scope, entity, report_type)
-        
-        # Excel dosyası oluştur
-        excel_file = create_report_excel(report_data, scope, report_type)
+        # Detay kayıtlar replikadan okunur; kayıtlar Excel yazılırken okunduğu
+        # için Excel de aynı bağlamda oluşturulur. Dönem toplamları
+        # get_period_statistics içinde birincil veritabanında kalır.
+        with replica_reads():
+            report_progress(self, 1, 3, 'Veriler toplanıyor')
+            report_data = collect_report_data(scope, entity, report_type)
+            
+            # Excel dosyası oluştur
+            report_progress(self, 2, 3, 'Excel dosyası oluşturuluyor')
+            excel_file = create_report_excel(report_data, scope, report_type)
         
+        report_progress(self, 3, 3, 'Rapor kaydediliyor')
         # Rapor kaydı oluştur
         report = Report.objects.create(
             title=f"{entity} - {report_type} Raporu",
@@ -53,6 +72,7 @@ def generate_report_task(self, user_id, scope, report_type, entity_id, **kwargs)
             report_type=report_type,
             scope=scope,
             report_date=timezone.now().date(),
+            metadata={'generation_key': generation_key} if generation_key else {},
             created_by=user
         )
         
@@ -68,6 +88,9 @@ def generate_report_task(self, user_id, scope, report_type, entity_id, **kwargs)
         
         report.save()
         
+        if generation_key:
+            cache.delete(report_task_cache_key(generation_key))
+        
         return {
             'success': True,
             'report_id': str(report.id),
@@ -76,12 +99,48 @@ def generate_report_task(self, user_id, scope, report_type, entity_id, **kwargs)
         }
         
     except Exception as exc:
+        if generation_key and self.request.retries >= self.max_retries:
+            cache.delete(report_task_cache_key(generation_key))
         # Retry on failure
         raise self.retry(exc=exc, countdown=60)
 
 
+REPORT_RECORD_FIELDS = ('title', 'type', 'amount', 'currency', 'date', 'description')
+
+# Write-only modda hücreler taranamadığı için sütun genişlikleri sabittir
+REPORT_DETAIL_COLUMNS = [
+    ('Başlık', 40),
+    ('Tür', 14),
+    ('Tutar', 16),
+    ('Para Birimi', 12),
+    ('Tarih', 12),
+    ('Açıklama', 50),
+]
+
+REPORT_CHUNK_SIZE = 2000
+
+
+def get_report_records(scope, entity, report_type):
+    """Scope ve rapor türüne göre mali kayıt queryset'i"""
+    if scope in SCOPES:
+        financial_records = FinancialRecord.objects.filter(**{f'related_{scope}': entity})
+    else:
+        financial_records = FinancialRecord.objects.none()
+    
+    # Tarih filtresi
+    start, end = get_report_period(report_type)
+    return filter_period(financial_records, start, end)
+
+
 def collect_report_data(scope, entity, report_type):
-    """Rapor verilerini topla"""
+    """
+    Rapor verilerini topla
+    Dönem raporlarının istatistikleri günlük kısmi toplamlardan oluşturulur
+    (bkz. core/reporting.py); özel raporlarda tek aggregate sorgusu kullanılır.
+    Detay kayıtlar listeye alınmaz, Excel yazılırken parça parça okunur.
+    """
+    from django.db.models import Sum, Count, Q
+    
     data = {
         'entity': str(entity),
         'scope': scope,
@@ -89,77 +148,68 @@ def collect_report_data(scope, entity, report_type):
         'generated_at': timezone.now(),
     }
     
-    # Financial records
-    if scope == 'company':
-        financial_records = FinancialRecord.objects.filter(related_company=entity)
-    elif scope == 'brand':
-        financial_records = FinancialRecord.objects.filter(related_brand=entity)
-    elif scope == 'branch':
-        financial_records = FinancialRecord.objects.filter(related_branch=entity)
-    elif scope == 'person':
-        financial_records = FinancialRecord.objects.filter(related_person=entity)
-    else:
-        financial_records = FinancialRecord.objects.none()
-    
-    # Tarih filtresi
-    if report_type == 'daily':
-        financial_records = financial_records.filter(date=timezone.now().date())
-    elif report_type == 'weekly':
-        week_ago = timezone.now().date() - timedelta(days=7)
-        financial_records = financial_records.filter(date__gte=week_ago)
-    elif report_type == 'monthly':
-        month_ago = timezone.now().date() - timedelta(days=30)
-        financial_records = financial_records.filter(date__gte=month_ago)
-    elif report_type == 'yearly':
-        year_ago = timezone.now().date() - timedelta(days=365)
-        financial_records = financial_records.filter(date__gte=year_ago)
+    financial_records = get_report_records(scope, entity, report_type)
     
     # Özet istatistikler
-    from django.db.models import Sum, Count
-    
-    data['statistics'] = {
-        'total_records': financial_records.count(),
-        'total_income': financial_records.filter(type='income').aggregate(Sum('amount'))['amount__sum'] or 0,
-        'total_expense': financial_records.filter(type='expense').aggregate(Sum('amount'))['amount__sum'] or 0,
-        'total_turnover': financial_records.filter(type='turnover').aggregate(Sum('amount'))['amount__sum'] or 0,
-    }
+    start, end = get_report_period(report_type)
+    if start is not None and scope in SCOPES:
+        data['statistics'] = get_period_statistics(scope, entity.pk, start, end)
+    else:
+        totals = financial_records.order_by().aggregate(
+            total_records=Count('id'),
+            total_income=Sum('amount', filter=Q(type='income')),
+            total_expense=Sum('amount', filter=Q(type='expense')),
+            total_turnover=Sum('amount', filter=Q(type='turnover')),
+        )
+        
+        data['statistics'] = {
+            'total_records': totals['total_records'],
+            'total_income': totals['total_income'] or 0,
+            'total_expense': totals['total_expense'] or 0,
+            'total_turnover': totals['total_turnover'] or 0,
+        }
     
     data['statistics']['net_profit'] = data['statistics']['total_income'] - data['statistics']['total_expense']
     
-    # Detaylı kayıtlar
-    data['records'] = list(financial_records.values(
-        'title', 'type', 'amount', 'currency', 'date', 'description'
-    ))
+    # Detaylı kayıtlar (lazy, chunk'lar halinde okunur)
+    data['records'] = financial_records.values_list(*REPORT_RECORD_FIELDS).iterator(
+        chunk_size=REPORT_CHUNK_SIZE
+    )
     
     return data
 
 
 def create_report_excel(report_data, scope, report_type):
-    """Rapor Excel dosyası oluştur"""
+    """
+    Rapor Excel dosyası oluştur
+    Write-only workbook kullanılır: satırlar diske akıtılır, bellek kullanımı
+    kayıt sayısından bağımsızdır.
+    """
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, Alignment, PatternFill
-    from openpyxl.chart import BarChart, PieChart, Reference
+    from openpyxl.utils import get_column_letter
     
-    wb = Workbook()
+    wb = Workbook(write_only=True)
     
     # Özet sayfası
-    ws_summary = wb.active
-    ws_summary.title = "Özet"
+    ws_summary = wb.create_sheet("Özet")
     
     # Başlık
-    ws_summary['A1'] = f"{report_data['entity']} - {report_type.upper()} Raporu"
-    ws_summary['A1'].font = Font(size=16, bold=True)
-    ws_summary['A1'].alignment = Alignment(horizontal='center')
-    ws_summary.merge_cells('A1:D1')
+    title_cell = WriteOnlyCell(ws_summary, value=f"{report_data['entity']} - {report_type.upper()} Raporu")
+    title_cell.font = Font(size=16, bold=True)
+    title_cell.alignment = Alignment(horizontal='center')
+    ws_summary.merged_cells.add('A1:D1')
+    ws_summary.append([title_cell])
+    ws_summary.append([])
     
-    ws_summary['A3'] = "Rapor Tarihi:"
-    ws_summary['B3'] = report_data['generated_at'].strftime('%Y-%m-%d %H:%M:%S')
+    ws_summary.append(["Rapor Tarihi:", report_data['generated_at'].strftime('%Y-%m-%d %H:%M:%S')])
+    ws_summary.append([])
     
     # İstatistikler
-    row = 5
-    ws_summary[f'A{row}'] = "İstatistikler"
-    ws_summary[f'A{row}'].font = Font(bold=True, size=14)
-    row += 1
+    section_cell = WriteOnlyCell(ws_summary, value="İstatistikler")
+    section_cell.font = Font(bold=True, size=14)
+    ws_summary.append([section_cell])
     
     stats = report_data['statistics']
     stats_data = [
@@ -170,49 +220,40 @@ def create_report_excel(report_data, scope, report_type):
         ['Net Kar', f"{stats['net_profit']:,.2f} TL"],
     ]
     
-    for stat_row in stats_data:
-        ws_summary[f'A{row}'] = stat_row[0]
-        ws_summary[f'B{row}'] = stat_row[1]
-        ws_summary[f'A{row}'].font = Font(bold=True)
-        row += 1
+    for label, value in stats_data:
+        label_cell = WriteOnlyCell(ws_summary, value=label)
+        label_cell.font = Font(bold=True)
+        ws_summary.append([label_cell, value])
     
     # Detay sayfası
-    if report_data['records']:
+    if stats['total_records']:
         ws_detail = wb.create_sheet("Detaylar")
         
-        # Header
-        headers = ['Başlık', 'Tür', 'Tutar', 'Para Birimi', 'Tarih', 'Açıklama']
-        ws_detail.append(headers)
+        for index, (_, width) in enumerate(REPORT_DETAIL_COLUMNS, start=1):
+            ws_detail.column_dimensions[get_column_letter(index)].width = width
         
-        # Style header
-        for cell in ws_detail[1]:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        # Header
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_row = []
+        for header, _ in REPORT_DETAIL_COLUMNS:
+            cell = WriteOnlyCell(ws_detail, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
             cell.alignment = Alignment(horizontal='center')
+            header_row.append(cell)
+        ws_detail.append(header_row)
         
         # Data
-        for record in report_data['records']:
+        for title, record_type, amount, currency, date, description in report_data['records']:
             ws_detail.append([
-                record['title'],
-                record['type'],
-                float(record['amount']),
-                record['currency'],
-                record['date'].strftime('%Y-%m-%d') if record['date'] else '',
-                record['description'] or '',
+                title,
+                record_type,
+                float(amount),
+                currency,
+                date.strftime('%Y-%m-%d') if date else '',
+                description or '',
             ])
-        
-        # Auto-width
-        for column in ws_detail.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_detail.column_dimensions[column_letter].width = adjusted_width
     
     # Save
     filename = generate_unique_filename(f'rapor_{scope}_{report_type}', 'xlsx')
@@ -223,42 +264,60 @@ def create_report_excel(report_data, scope, report_type):
     return f"reports/{filename}"
 
 
+def build_contract_context(contract):
+    """Sözleşme şablonu için bağlam verisi"""
+    context_data = {
+        'contract_number': contract.contract_number,
+        'title': contract.title,
+        'start_date': contract.start_date.strftime('%Y-%m-%d'),
+        'end_date': contract.end_date.strftime('%Y-%m-%d') if contract.end_date else 'Belirtilmemiş',
+        'status': contract.get_status_display(),
+    }
+    
+    # İlişkili entity bilgileri
+    if contract.related_person:
+        context_data['person_name'] = contract.related_person.full_name
+        context_data['person_address'] = contract.related_person.address or ''
+    
+    if contract.related_company:
+        context_data['company_name'] = contract.related_company.title
+        context_data['company_tax_number'] = contract.related_company.tax_number
+    
+    return context_data
+
+
 @shared_task(bind=True)
 def generate_contract_pdf_task(self, contract_id):
     """Sözleşmeden PDF oluştur"""
     try:
         contract = Contract.objects.get(id=contract_id)
         
-        # Sözleşme verileri
-        context_data = {
-            'contract_number': contract.contract_number,
-            'title': contract.title,
-            'start_date': contract.start_date.strftime('%Y-%m-%d'),
-            'end_date': contract.end_date.strftime('%Y-%m-%d') if contract.end_date else 'Belirtilmemiş',
-            'status': contract.get_status_display(),
-        }
-        
-        # İlişkili entity bilgileri
-        if contract.related_person:
-            context_data['person_name'] = contract.related_person.full_name
-            context_data['person_address'] = contract.related_person.address or ''
-        
-        if contract.related_company:
-            context_data['company_name'] = contract.related_company.title
-            context_data['company_tax_number'] = contract.related_company.tax_number
+        context_data = build_contract_context(contract)
         
         # Template'ten oluştur
         if contract.template_name:
+            report_progress(self, 1, 3, 'Şablon işleniyor')
             doc_buffer = generate_contract_from_template(contract.template_name, context_data)
             
-            # Save as PDF (docx to pdf conversion - requires additional package)
-            # For now, save as docx
-            filename = generate_unique_filename(f'sozlesme_{contract.contract_number}', 'docx')
+            # Sıcak dönüştürücü havuzu ile PDF'e çevir; dönüştürücü kapalıysa DOCX kaydedilir
+            report_progress(self, 2, 3, 'PDF oluşturuluyor')
+            content = doc_buffer.getvalue()
+            extension = 'docx'
+            try:
+                pdf_content = convert_docx_to_pdf(content)
+            except ConversionError as exc:
+                logger.warning(f"Sözleşme {contract.contract_number} PDF'e çevrilemedi: {exc}")
+                pdf_content = None
+            if pdf_content:
+                content, extension = pdf_content, 'pdf'
+            
+            filename = generate_unique_filename(f'sozlesme_{contract.contract_number}', extension)
             filepath = os.path.join(settings.MEDIA_ROOT, 'contracts', filename)
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
+            report_progress(self, 3, 3, 'Dosya kaydediliyor')
             with open(filepath, 'wb') as f:
-                f.write(doc_buffer.read())
+                f.write(content)
             
             # Update contract file
             contract.file = f"contracts/{filename}"
@@ -274,69 +333,188 @@ def generate_contract_pdf_task(self, contract_id):
         return {'success': False, 'error': str(exc)}
 
 
-@shared_task
+def _render_contract_document(job):
+    """
+    Tek sözleşme belgesi üret; hata batch'i durdurmaz
+    Dönüştürücü açıksa PDF'e çevrilir, çevrilemezse DOCX olarak kalır.
+    """
+    name, template_name, context_data = job
+    try:
+        content = generate_contract_from_template(template_name, context_data).getvalue()
+    except Exception as exc:
+        return f'{name}.docx', None, str(exc)
+    
+    try:
+        pdf_content = convert_docx_to_pdf(content)
+    except ConversionError as exc:
+        logger.warning(f"{name} PDF'e çevrilemedi: {exc}")
+        pdf_content = None
+    if pdf_content:
+        return f'{name}.pdf', pdf_content, None
+    return f'{name}.docx', content, None
+
+
+def _map_bounded(executor, func, items, window):
+    """executor.map gibi sıralı sonuç üretir; aynı anda en fazla window iş bekler"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+@shared_task(bind=True)
+def generate_contracts_batch_task(self, contract_ids):
+    """
+    Birden fazla sözleşmenin belgesini üretip tek ZIP arşivinde topla
+    Belgeler task process'i içindeki bir thread pool'da render edilir (prefork
+    worker'ları daemon olduğundan alt process açamaz), dönüştürücü açıksa
+    sıcak havuzla PDF'e çevrilir ve hazır oldukça geçici dosyadaki ZIP'e
+    yazılır; arşiv sonunda storage'a aktarılır.
+    """
+    import tempfile
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+    from django.core.files import File
+    from django.core.files.storage import default_storage
+    
+    contracts = Contract.objects.filter(id__in=contract_ids).select_related(
+        'related_person', 'related_company'
+    ).order_by('contract_number')
+    
+    total = len(contract_ids)
+    jobs = (
+        (
+            f"sozlesme_{contract.contract_number}",
+            contract.template_name or '',
+            build_contract_context(contract),
+        )
+        for contract in contracts.iterator(chunk_size=500)
+    )
+    
+    errors = []
+    done = 0
+    workers = max(settings.CONTRACT_BATCH_WORKERS, 1)
+    
+    with tempfile.TemporaryFile() as archive_file:
+        with zipfile.ZipFile(archive_file, 'w', zipfile.ZIP_DEFLATED) as archive, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            results = _map_bounded(executor, _render_contract_document, jobs, workers * 4)
+            for filename, content, error in results:
+                if error:
+                    errors.append({'file': filename, 'error': error})
+                else:
+                    archive.writestr(filename, content)
+                done += 1
+                if done % 50 == 0:
+                    report_progress(self, done, total, 'Sözleşmeler oluşturuluyor')
+        
+        report_progress(self, done, total, 'Arşiv kaydediliyor')
+        archive_file.seek(0)
+        filename = generate_unique_filename('sozlesmeler', 'zip')
+        saved_name = default_storage.save(f'exports/contracts/{filename}', File(archive_file))
+    
+    return {
+        'success': True,
+        'count': done - len(errors),
+        'errors': errors,
+        'file_url': default_storage.url(saved_name),
+    }
+
+
+@shared_task(bind=True)
+def export_pdf_task(self, export_name, ids, ordering):
+    """
+    Büyük PDF export'unu worker'da üret (bkz. core.views.pdf_export_response)
+    Kayıtlar istekte filtrelenmiş id'lerle ve aynı sıralamayla yeniden seçilir.
+    """
+    from .pdf_reports import get_pdf_exports
+    
+    model, export = get_pdf_exports()[export_name]
+    report_progress(self, 0, 1, 'PDF oluşturuluyor')
+    queryset = model.objects.filter(pk__in=ids).order_by(*ordering)
+    
+    return {
+        'success': True,
+        'download_url': export(queryset),
+        'format': 'pdf',
+    }
+
+
+@shared_task(use_replica=True)
 def send_expiring_contracts_notification():
     """
     Vadesi yaklaşan sözleşmeler için bildirim gönder
     Her gün çalışır (Celery Beat)
     """
-    threshold_date = timezone.now().date() + timedelta(days=30)
+    from .notifications import build_company_digest, send_digest
+    
+    today = timezone.now().date()
+    threshold_date = today + timedelta(days=30)
     
     expiring_contracts = Contract.objects.filter(
         status='active',
         end_date__lte=threshold_date,
-        end_date__gte=timezone.now().date()
+        end_date__gte=today
     )
     
-    if expiring_contracts.exists():
-        # Admin kullanıcılara e-posta gönder
-        admin_emails = User.objects.filter(is_staff=True).values_list('email', flat=True)
-        
-        message = f"Yakında {expiring_contracts.count()} adet sözleşmenin süresi dolacak.\n\n"
-        for contract in expiring_contracts[:10]:
-            message += f"- {contract.title} ({contract.contract_number}): {contract.end_date}\n"
+    digest = build_company_digest(
+        expiring_contracts,
+        fields=('title', 'contract_number', 'end_date'),
+        order_by='end_date',
+    )
+    
+    if digest['count']:
+        message = f"Yakında {digest['count']} adet sözleşmenin süresi dolacak.\n"
+        for company in digest['companies']:
+            message += f"\n{company['company']} ({company['count']} sözleşme)\n"
+            for contract in company['items']:
+                message += f"- {contract['title']} ({contract['contract_number']}): {contract['end_date']}\n"
         
-        send_mail(
-            subject='Vadesi Yaklaşan Sözleşmeler',
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=list(admin_emails),
-            fail_silently=True,
-        )
+        send_digest('Vadesi Yaklaşan Sözleşmeler', message)
     
-    return f"{expiring_contracts.count()} sözleşme için bildirim gönderildi"
+    return f"{digest['count']} sözleşme için bildirim gönderildi"
 
 
-@shared_task
+@shared_task(use_replica=True)
 def send_overdue_notes_notification():
     """
     Vadesi geçmiş senetler için bildirim gönder
     Her gün çalışır (Celery Beat)
     """
-    overdue_notes = PromissoryNote.objects.filter(
-        due_date__lt=timezone.now().date(),
-        payment_status='pending'
+    from .lifecycle import overdue_notes_condition
+    from .notifications import build_company_digest, send_digest
+    
+    overdue_notes = PromissoryNote.objects.filter(overdue_notes_condition())
+    
+    digest = build_company_digest(
+        overdue_notes,
+        fields=('title', 'note_number', 'amount', 'due_date'),
+        order_by='due_date',
+        sum_field='amount',
     )
     
-    if overdue_notes.exists():
-        admin_emails = User.objects.filter(is_staff=True).values_list('email', flat=True)
+    if digest['count']:
+        message = f"Vadesi geçmiş {digest['count']} adet senet bulunmaktadır.\n"
+        message += f"Toplam Tutar: {digest['total']:,.2f} TL\n"
+        for company in digest['companies']:
+            message += f"\n{company['company']} ({company['count']} senet, {company['total']:,.2f} TL)\n"
+            for note in company['items']:
+                message += f"- {note['title']} ({note['note_number']}): {note['amount']} TL - Vade: {note['due_date']}\n"
         
-        total_amount = sum(note.amount for note in overdue_notes)
-        message = f"Vadesi geçmiş {overdue_notes.count()} adet senet bulunmaktadır.\n"
-        message += f"Toplam Tutar: {total_amount:,.2f} TL\n\n"
-        
-        for note in overdue_notes[:10]:
-            message += f"- {note.title} ({note.note_number}): {note.amount} TL - Vade: {note.due_date}\n"
-        
-        send_mail(
-            subject='Vadesi Geçmiş Senetler',
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=list(admin_emails),
-            fail_silently=True,
-        )
+        send_digest('Vadesi Geçmiş Senetler', message)
     
-    return f"{overdue_notes.count()} senet için bildirim gönderildi"
+    return f"{digest['count']} senet için bildirim gönderildi"
+
+
+def get_system_user():
+    """Zamanlanmış işler için sistem kullanıcısı (REPORT_SYSTEM_USERNAME)"""
+    user = User.objects.filter(username=settings.REPORT_SYSTEM_USERNAME).first()
+    if user is None:
+        user = User.objects.filter(is_superuser=True).order_by('id').first()
+    return user
 
 
 @shared_task
@@ -344,27 +522,134 @@ def generate_scheduled_reports():
     """
     Zamanlanmış raporları oluştur
     Her gün gece yarısı çalışır (Celery Beat)
+    
+    Son günlük raporundan bu yana mali kaydı değişmeyen şirketler atlanır;
+    kalanlar REPORT_FANOUT_BATCH_SIZE'lık gruplar halinde, gruplar arasında
+    REPORT_FANOUT_BATCH_INTERVAL saniye beklenerek kuyruğa verilir.
     """
-    from django.db.models import Q
+    from django.db.models import F, Q, OuterRef, Subquery
+    
+    system_user = get_system_user()
+    if system_user is None:
+        return "Sistem kullanıcısı bulunamadı, raporlar oluşturulmadı"
+    
+    last_report = Report.objects.filter(
+        company=OuterRef('pk'), scope='company', report_type='daily'
+    ).order_by('-created_at').values('created_at')[:1]
+    last_activity = FinancialRecord.objects.filter(
+        related_company=OuterRef('pk')
+    ).order_by('-updated_at').values('updated_at')[:1]
+    
+    # Tek sorgu: yalnızca yeni verisi olan aktif şirketler
+    company_ids = [
+        str(company_id) for company_id in Company.objects.filter(is_active=True).annotate(
+            last_report_at=Subquery(last_report),
+            last_activity_at=Subquery(last_activity),
+        ).filter(
+            Q(last_report_at__isnull=True) | Q(last_activity_at__gt=F('last_report_at')),
+            last_activity_at__isnull=False,
+        ).order_by().values_list('id', flat=True)
+    ]
     
-    # Bugün oluşturulması gereken raporları kontrol et
-    # (Bu özellik için ayrı bir ScheduledReport modeli gerekebilir)
+    if not company_ids:
+        return "Yeni verisi olan şirket yok, rapor oluşturulmadı"
     
-    # Örnek: Her şirket için günlük rapor
-    companies = Company.objects.filter(is_active=True)
+    dispatch_report_batch.delay(company_ids, system_user.id, 'daily')
     
-    for company in companies:
-        try:
-            generate_report_task.delay(
-                user_id=1,  # System user
-                scope='company',
-                report_type='daily',
-                entity_id=str(company.id)
-            )
-        except Exception as e:
-            print(f"Rapor oluşturma hatası: {e}")
+    return f"{len(company_ids)} şirket için günlük rapor oluşturma başlatıldı"
+
+
+@shared_task
+def dispatch_report_batch(company_ids, user_id, report_type, group_ids=None):
+    """Sıradaki şirket grubunu Celery group olarak gönder, kalanı için kendini yeniden planla"""
+    from celery import group
+    
+    group_ids = list(group_ids or [])
+    batch_size = settings.REPORT_FANOUT_BATCH_SIZE
+    batch, remaining = company_ids[:batch_size], company_ids[batch_size:]
+    
+    result = group(
+        generate_report_task.s(
+            user_id=user_id,
+            scope='company',
+            report_type=report_type,
+            entity_id=company_id
+        )
+        for company_id in batch
+    ).apply_async()
+    result.save()
+    group_ids.append(result.id)
+    
+    if remaining:
+        dispatch_report_batch.apply_async(
+            args=[remaining, user_id, report_type, group_ids],
+            countdown=settings.REPORT_FANOUT_BATCH_INTERVAL
+        )
+    else:
+        summarize_report_run.apply_async(
+            args=[group_ids],
+            countdown=settings.REPORT_FANOUT_BATCH_INTERVAL
+        )
+    
+    return f"{len(batch)} rapor kuyruğa alındı, {len(remaining)} bekliyor"
+
+
+def _report_run_max_polls(batch_count):
+    """Özet task'ının en fazla kaç kez yeniden deneneceği: grup başına bir bekleme ve pay"""
+    poll_interval = settings.REPORT_SUMMARY_POLL_INTERVAL
+    budget = batch_count * poll_interval + settings.REPORT_SUMMARY_MARGIN
+    return max(math.ceil(budget / poll_interval), 1)
+
+
+@shared_task(bind=True, max_retries=None)
+def summarize_report_run(self, group_ids):
+    """
+    Toplu rapor çalıştırmasının başarı/hata özetini çıkar
+    Bekleme süresi grup sayısına göre belirlenir; süre dolarsa bitmeyen
+    task'lar da sayılarak kısmi özet loglanır ve gruplar yine silinir.
+    """
+    from celery.result import GroupResult
+    
+    results = []
+    for group_id in group_ids:
+        group_result = GroupResult.restore(group_id)
+        if group_result is not None:
+            results.extend(group_result.results)
+    
+    ready = [result for result in results if result.ready()]
+    complete = len(ready) == len(results)
+    if not complete and self.request.retries < _report_run_max_polls(len(group_ids)):
+        raise self.retry(countdown=settings.REPORT_SUMMARY_POLL_INTERVAL)
+    
+    summary = {
+        'total': len(results),
+        'succeeded': sum(1 for result in ready if result.successful()),
+        'failed': sum(1 for result in ready if result.failed()),
+        'pending': len(results) - len(ready),
+        'failures': [
+            {'task_id': result.id, 'error': str(result.result)}
+            for result in ready if result.failed()
+        ],
+    }
+    
+    if complete:
+        logger.info(
+            "Zamanlanmış rapor çalıştırması tamamlandı: %(succeeded)s başarılı, %(failed)s hatalı",
+            summary
+        )
+    else:
+        logger.warning(
+            "Zamanlanmış rapor çalıştırması beklenen sürede bitmedi: %(succeeded)s başarılı, "
+            "%(failed)s hatalı, %(pending)s tamamlanmadı",
+            summary
+        )
     
-    return f"{companies.count()} şirket için günlük rapor oluşturma başlatıldı"
+    for group_id in group_ids:
+        group_result = GroupResult.restore(group_id)
+        if group_result is not None:
+            group_result.delete()
+    
+    return summary
 
 
 @shared_task
@@ -372,25 +657,60 @@ def cleanup_old_files():
     """
     Eski dosyaları temizle
     Haftada bir çalışır
+    Raporlar birincil anahtara göre (keyset) sayfalanır; her sayfanın dosyaları
+    toplu silinir ve yalnızca dosyası gerçekten silinen satırlar kaldırılır.
+    Silinemeyen dosyaların satırları bir sonraki çalıştırmada yeniden denenir.
     """
-    from django.core.files.storage import default_storage
+    from .file_cleanup import delete_files
     
     # 90 günden eski raporları sil
     threshold_date = timezone.now() - timedelta(days=90)
-    old_reports = Report.objects.filter(created_at__lt=threshold_date)
+    old_reports = Report.objects.filter(created_at__lt=threshold_date).order_by('pk')
+    batch_size = settings.FILE_CLEANUP_BATCH_SIZE
     
     deleted_count = 0
-    for report in old_reports:
-        if report.file:
-            try:
-                default_storage.delete(report.file.name)
-                deleted_count += 1
-            except:
-                pass
+    removed_rows = 0
+    failed_count = 0
+    last_pk = None
     
-    old_reports.delete()
+    while True:
+        page = old_reports if last_pk is None else old_reports.filter(pk__gt=last_pk)
+        rows = list(page.values_list('pk', 'file')[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        
+        deleted = delete_files(name for _, name in rows)
+        removable = [pk for pk, name in rows if not name or name in deleted]
+        
+        Report.objects.filter(pk__in=removable).delete()
+        deleted_count += len(deleted)
+        removed_rows += len(removable)
+        failed_count += len(rows) - len(removable)
     
-    return f"{deleted_count} eski dosya temizlendi"
+    if failed_count:
+        logger.warning(f"{failed_count} raporun dosyası silinemedi, satırlar korundu")
+    
+    return f"{deleted_count} eski dosya temizlendi, {removed_rows} rapor silindi"
+
+
+@shared_task
+def cleanup_orphaned_media():
+    """
+    Veritabanında karşılığı olmayan medya dosyalarını temizle
+    Haftada bir çalışır (Celery Beat)
+    """
+    from .media_gc import cleanup_all_media
+    
+    results = cleanup_all_media()
+    deleted = sum(result.deleted for result in results)
+    reclaimed = sum(result.reclaimed_bytes for result in results)
+    failed = sum(result.failed for result in results)
+    
+    if failed:
+        logger.warning(f"{failed} sahipsiz dosya silinemedi")
+    
+    return {'deleted': deleted, 'reclaimed_bytes': reclaimed, 'failed': failed}
 
 
 @shared_task(bind=True, max_retries=3)
@@ -417,16 +737,11 @@ def import_excel_data_task(self, file_path, import_type, user_id):
 def update_contract_statuses():
     """
     Sözleşme durumlarını güncelle (expired olarak işaretle)
-    Her gün çalışır
+    Her gün çalışır (Celery Beat)
     """
-    today = timezone.now().date()
-    
-    # Süreleri dolan sözleşmeleri expired yap
-    expired_count = Contract.objects.filter(
-        status='active',
-        end_date__lt=today
-    ).update(status='expired')
+    from .lifecycle import expire_contracts
     
+    expired_count = expire_contracts()
     return f"{expired_count} sözleşme expired olarak işaretlendi"
 
 
@@ -434,16 +749,11 @@ def update_contract_statuses():
 def update_promissory_note_statuses():
     """
     Senet durumlarını güncelle (overdue olarak işaretle)
-    Her gün çalışır
+    Her gün çalışır (Celery Beat)
     """
-    today = timezone.now().date()
-    
-    # Vadesi geçen senetleri overdue yap
-    overdue_count = PromissoryNote.objects.filter(
-        payment_status='pending',
-        due_date__lt=today
-    ).update(payment_status='overdue')
+    from .lifecycle import mark_overdue_notes
     
+    overdue_count = mark_overdue_notes()
     return f"{overdue_count} senet overdue olarak işaretlendi"
 
 
@@ -452,92 +762,103 @@ def generate_monthly_financial_summary():
     """
     Aylık mali özet raporu oluştur
     Her ayın 1'inde çalışır
+    Tüm şirketlerin toplamları (şirket, tür) bazında tek sorguda hesaplanır,
+    monthly_financial_summaries tablosuna yazılır; her yöneticiye tüm şirketleri
+    içeren tek bir özet e-postası gönderilir.
     """
-    from django.db.models import Sum
+    from django.db.models import Count, Sum
     from dateutil.relativedelta import relativedelta
+    from .models import MonthlyFinancialSummary
+    from .notifications import get_staff_emails, send_messages_in_batches
     
     # Geçen ay
     today = timezone.now().date()
     last_month_start = (today.replace(day=1) - relativedelta(months=1))
     last_month_end = today.replace(day=1) - timedelta(days=1)
     
-    # Her şirket için özet
-    companies = Company.objects.filter(is_active=True)
-    
-    for company in companies:
-        records = FinancialRecord.objects.filter(
-            related_company=company,
-            date__gte=last_month_start,
-            date__lte=last_month_end
+    companies = dict(Company.objects.filter(is_active=True).values_list('id', 'title'))
+    
+    # Toplam taraması replikadan okunur (satırlar bağlam içinde listeye alınır)
+    with replica_reads():
+        totals = list(
+            FinancialRecord.objects.filter(
+                related_company_id__in=companies.keys(),
+                date__gte=last_month_start,
+                date__lte=last_month_end
+            ).order_by().values('related_company_id', 'type').annotate(
+                total=Sum('amount'),
+                count=Count('id'),
+            )
         )
-        
-        summary = {
-            'company': company.title,
-            'period': f"{last_month_start} - {last_month_end}",
-            'total_income': records.filter(type='income').aggregate(Sum('amount'))['amount__sum'] or 0,
-            'total_expense': records.filter(type='expense').aggregate(Sum('amount'))['amount__sum'] or 0,
-            'total_turnover': records.filter(type='turnover').aggregate(Sum('amount'))['amount__sum'] or 0,
-        }
-        
-        summary['net_profit'] = summary['total_income'] - summary['total_expense']
-        
-        # E-posta gönder
-        admin_emails = User.objects.filter(is_staff=True).values_list('email', flat=True)
-        
-        message = f"Aylık Mali Özet - {company.title}\n"
-        message += f"Dönem: {summary['period']}\n\n"
-        message += f"Toplam Gelir: {summary['total_income']:,.2f} TL\n"
-        message += f"Toplam Gider: {summary['total_expense']:,.2f} TL\n"
-        message += f"Toplam Ciro: {summary['total_turnover']:,.2f} TL\n"
-        message += f"Net Kar: {summary['net_profit']:,.2f} TL\n"
-        
-        send_mail(
-            subject=f'Aylık Mali Özet - {company.title}',
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=list(admin_emails),
-            fail_silently=True,
+    
+    computed_at = timezone.now()
+    summaries = {
+        company_id: MonthlyFinancialSummary(
+            company_id=company_id, period=last_month_start, computed_at=computed_at
         )
+        for company_id in companies
+    }
+    for row in totals:
+        summary = summaries[row['related_company_id']]
+        summary.record_count += row['count']
+        field = f"total_{row['type']}"
+        if hasattr(summary, field):
+            setattr(summary, field, row['total'] or 0)
+    for summary in summaries.values():
+        summary.net_profit = summary.total_income - summary.total_expense
+    
+    MonthlyFinancialSummary.objects.bulk_create(
+        summaries.values(),
+        update_conflicts=True,
+        unique_fields=['company', 'period'],
+        update_fields=[
+            'record_count', 'total_income', 'total_expense', 'total_turnover',
+            'total_profit_share', 'net_profit', 'computed_at',
+        ],
+    )
     
-    return f"{companies.count()} şirket için aylık özet gönderildi"
+    # E-posta: tüm şirketlerin toplamları tek bir özette; her yöneticiye ayrı
+    # mesaj (alıcılar birbirini görmez), parçalar halinde tek bağlantı üzerinden
+    period = f"{last_month_start} - {last_month_end}"
+    lines = ["Aylık Mali Özet", f"Dönem: {period}"]
+    for company_id, title in sorted(companies.items(), key=lambda item: item[1]):
+        summary = summaries[company_id]
+        lines += [
+            "",
+            title,
+            f"Toplam Gelir: {summary.total_income:,.2f} TL",
+            f"Toplam Gider: {summary.total_expense:,.2f} TL",
+            f"Toplam Ciro: {summary.total_turnover:,.2f} TL",
+            f"Net Kar: {summary.net_profit:,.2f} TL",
+        ]
+    message = "\n".join(lines) + "\n"
+    messages = [
+        (f'Aylık Mali Özet - {period}', message, settings.DEFAULT_FROM_EMAIL, [email])
+        for email in get_staff_emails()
+    ]
+    send_messages_in_batches(messages)
+    
+    return f"{len(summaries)} şirket için aylık özet gönderildi"
 
 
 @shared_task
 def backup_database():
     """
     Veritabanı yedeği al (PostgreSQL için)
-    Haftada bir çalışır
+    Haftada bir çalışır (Celery Beat)
+    Paralel dizin formatında dump alınır, yedek storage'ına aktarılıp
+    checksum ile doğrulanır ve saklama politikası uygulanır (bkz. core/backups.py).
     """
-    import subprocess
-    from django.conf import settings
-    
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_file = f"backup_{timestamp}.sql"
-    backup_path = os.path.join(settings.MEDIA_ROOT, 'backups', backup_file)
-    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+    from .backups import BackupError, create_backup
     
     try:
-        # PostgreSQL backup
-        db_config = settings.DATABASES['default']
-        cmd = [
-            'pg_dump',
-            '-h', db_config['HOST'],
-            '-U', db_config['USER'],
-            '-d', db_config['NAME'],
-            '-f', backup_path
-        ]
-        
-        env = os.environ.copy()
-        env['PGPASSWORD'] = db_config['PASSWORD']
-        
-        subprocess.run(cmd, env=env, check=True)
-        
-        # S3'e yükle (opsiyonel)
-        if settings.USE_S3:
-            # Upload to S3
-            pass
-        
-        return f"Yedek başarıyla alındı: {backup_file}"
-        
-    except Exception as e:
-        return f"Yedek hatası: {str(e)}"
\ No newline at end of file
+        result = create_backup()
+    except (BackupError, OSError) as exc:
+        logger.error(f"Yedek hatası: {exc}")
+        return {'success': False, 'error': str(exc)}
+    
+    logger.info(
+        f"Yedek alındı: {result['name']} ({result['files']} dosya, {result['size']} bayt), "
+        f"silinen eski yedekler: {len(result['removed'])}"
+    )
+    return {'success': True, **result}
@@ -0,0 +1,358 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from .models import Company, Brand, Branch, Role, Person, FinancialRecord, PromissoryNote, Contract, Report
+from .views import (
+    CompanyViewSet, BrandViewSet, BranchViewSet, PersonViewSet, FinancialRecordViewSet,
+    ContractViewSet, PromissoryNoteViewSet, ReportViewSet
+)
+
+
+@override_settings(LIST_CACHE_ENABLED=False)
+class ValuesListParityTestCase(TestCase):
+    """values() liste hızlı yolu serializer'larla aynı çıktıyı üretmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass123')
+
+        company = Company.objects.create(title='Örnek A.Ş.', tax_number='1234567890', email='info@ornek.com')
+        Company.objects.create(title='Boş Şirket', tax_number='0987654321', email='bos@ornek.com', is_active=False)
+        brand = Brand.objects.create(company=company, name='Marka', phone='02120000000')
+        branch = Branch.objects.create(
+            brand=brand, name='Merkez', address='İstanbul', phone='02120000001', email='merkez@ornek.com'
+        )
+        employee = Role.objects.create(name='employee', display_name='Çalışan')
+        manager = Role.objects.create(name='manager', display_name='Yönetici')
+        Person.objects.create(full_name='Ayşe Yılmaz', national_id='12345678901', role=employee, branch=branch)
+        Person.objects.create(full_name='Mehmet Demir', role=manager, branch=branch)
+
+        FinancialRecord.objects.create(
+            title='Satış', type='income', amount=Decimal('1500.50'), date=date(2024, 1, 15),
+            related_company=company
+        )
+        FinancialRecord.objects.create(
+            title='Kira', type='expense', amount=Decimal('800'), currency='USD', date=date(2024, 2, 1)
+        )
+
+        Contract.objects.create(
+            title='Kira Sözleşmesi', contract_number='SZ-001', start_date=date(2024, 1, 1),
+            end_date=date(2099, 12, 31), status='active', related_branch=branch
+        )
+        Contract.objects.create(
+            title='Eski Sözleşme', contract_number='SZ-002', start_date=date(2020, 1, 1),
+            end_date=date(2021, 1, 1), status='active', related_company=company
+        )
+        Contract.objects.create(title='Taslak', contract_number='SZ-003', start_date=date(2024, 1, 1))
+
+        PromissoryNote.objects.create(
+            title='Senet', note_number='S-001', amount=Decimal('1000'), due_date=date(2024, 1, 31),
+            related_branch=branch
+        )
+        PromissoryNote.objects.create(
+            title='Ödenmiş Senet', note_number='S-002', amount=Decimal('250.75'), due_date=date(2099, 1, 31),
+            payment_status='paid'
+        )
+
+        cls.user.first_name, cls.user.last_name = 'Ali', 'Veli'
+        cls.user.save()
+        Report.objects.create(
+            title='Günlük Rapor', report_type='daily', scope='company', company=company,
+            report_date=date(2024, 1, 15), file='reports/gunluk.xlsx', tags=['otomatik'], created_by=cls.user
+        )
+        Report.objects.create(
+            title='Özel Rapor', report_type='custom', scope='company', company=company,
+            report_date=date(2024, 2, 1)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertListParity(self, viewset_class, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        view = viewset_class()
+        view.action = 'list'
+        view.request = Request(APIRequestFactory().get(url))
+        view.format_kwarg = None
+        view.kwargs = {}
+        queryset = view.filter_queryset(view.get_queryset())
+        expected = view.get_serializer_class()(
+            queryset, many=True, context=view.get_serializer_context()
+        ).data
+
+        self.assertTrue(expected)
+        self.assertEqual(
+            JSONRenderer().render(response.data['results']),
+            JSONRenderer().render(expected),
+        )
+
+    def test_company_list(self):
+        self.assertListParity(CompanyViewSet, '/api/companies/')
+        self.assertListParity(CompanyViewSet, '/api/companies/?ordering=title&search=A.Ş.')
+
+    def test_brand_list(self):
+        self.assertListParity(BrandViewSet, '/api/brands/')
+
+    def test_branch_list(self):
+        self.assertListParity(BranchViewSet, '/api/branches/')
+
+    def test_person_list(self):
+        self.assertListParity(PersonViewSet, '/api/people/')
+
+    def test_financial_record_list(self):
+        self.assertListParity(FinancialRecordViewSet, '/api/financial-records/')
+
+    def test_contract_list(self):
+        self.assertListParity(ContractViewSet, '/api/contracts/')
+
+    def test_promissory_note_list(self):
+        self.assertListParity(PromissoryNoteViewSet, '/api/promissory-notes/')
+
+    def test_report_list(self):
+        self.assertListParity(ReportViewSet, '/api/reports/')
+
+
+@override_settings(LIST_CACHE_ENABLED=True)
+class ListCacheTestCase(TestCase):
+    """Liste önbelleği yazmadan sonra eski veri döndürmemeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass123')
+        cls.other = User.objects.create_user(username='other', password='testpass123')
+        cls.company = Company.objects.create(title='Örnek A.Ş.', tax_number='1234567890', email='info@ornek.com')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def list_titles(self):
+        response = self.client.get('/api/companies/')
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.data['results']]
+
+    def test_write_invalidates_list(self):
+        self.assertEqual(self.list_titles(), ['Örnek A.Ş.'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/companies/{self.company.pk}/', {'title': 'Yeni Unvan A.Ş.'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.list_titles(), ['Yeni Unvan A.Ş.'])
+
+    def test_cache_key_scope(self):
+        def cache_key(user, per_user):
+            view = CompanyViewSet()
+            view.list_cache_per_user = per_user
+            request = Request(APIRequestFactory().get('/api/companies/'))
+            request.user = user
+            return view.get_list_cache_key(request)
+
+        self.assertNotEqual(cache_key(self.user, True), cache_key(self.other, True))
+        self.assertEqual(cache_key(self.user, False), cache_key(self.other, False))
+
+
+class SparseFieldsTestCase(TestCase):
+    """?fields= / ?expand= detay yanıtını ve sorgusunu daraltmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass123')
+
+        company = Company.objects.create(title='Örnek A.Ş.', tax_number='1234567890', email='info@ornek.com')
+        brand = Brand.objects.create(company=company, name='Marka', phone='02120000000')
+        cls.branch = Branch.objects.create(
+            brand=brand, name='Merkez', address='İstanbul', phone='02120000001', email='merkez@ornek.com'
+        )
+        cls.role = Role.objects.create(name='employee', display_name='Çalışan')
+        cls.person = Person.objects.create(
+            full_name='Ayşe Yılmaz', national_id='12345678901', role=cls.role, branch=cls.branch
+        )
+        FinancialRecord.objects.create(
+            title='Maaş', type='expense', amount=Decimal('1000'), date=date(2024, 1, 31),
+            related_person=cls.person
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/people/{self.person.pk}/'
+
+    def test_default_response_unchanged(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['branch']['name'], 'Merkez')
+        self.assertEqual(response.data['financial_records_count'], 1)
+        self.assertIn('masked_national_id', response.data)
+
+    def test_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,full_name,masked_national_id,financial_records_count'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.data), {'id', 'full_name', 'masked_national_id', 'financial_records_count'}
+        )
+        self.assertEqual(response.data['masked_national_id'], '123****01')
+        self.assertEqual(response.data['financial_records_count'], 1)
+
+    def test_expand(self):
+        response = self.client.get(self.url, {'fields': 'id,role,branch', 'expand': 'branch'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['branch']['name'], 'Merkez')
+        self.assertEqual(str(response.data['role']), str(self.role.pk))
+
+
+class TaskStatusAccessTestCase(TestCase):
+    """Task durumu yalnızca task'ı başlatan kullanıcıya açık olmalı"""
+
+    task_id = 'b8a0e5d6-6a55-4b6e-9a7e-2f1d9c1e4a10'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', password='testpass123')
+        cls.other = User.objects.create_user(username='other', password='testpass123')
+
+    def setUp(self):
+        from .progress import grant_task_access
+
+        cache.clear()
+        grant_task_access(self.task_id, self.owner)
+        self.client = APIClient()
+
+    # Yalnızca erişim kontrolleri test edilir; task durumu Celery sonuç
+    # backend'ine (Redis) gittiği için 200 yolları burada çağrılmaz.
+
+    def test_retrieve_requires_owner(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task_id}/').status_code, 404)
+
+    def test_events_with_query_token(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.post(f'/api/tasks/{self.task_id}/events-token/').status_code, 404)
+
+        self.client.force_authenticate(self.owner)
+        token = self.client.post(f'/api/tasks/{self.task_id}/events-token/').data['token']
+        self.client.force_authenticate(None)
+
+        # Token başka bir task için kullanılamaz
+        other_task = '0f4c7a8e-3b1d-4c2e-8f5a-6d9b2e1c7a34'
+        response = self.client.get(f'/api/tasks/{other_task}/events/', {'token': token})
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(f'/api/tasks/{self.task_id}/events/', {'token': 'bozuk'})
+        self.assertIn(response.status_code, (401, 403))
+
+
+class ContractBatchGenerateTestCase(TestCase):
+    """Toplu belge isteğinde geçersiz id'ler 400 dönmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_invalid_ids(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/contracts/batch_generate/', {'ids': ['1', 'abc']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ids', response.data)
+
+
+class MonthlyFinancialSummaryEmailTestCase(TestCase):
+    """Aylık özet her yöneticiye tüm şirketleri içeren tek mesaj olarak gitmeli"""
+
+    def test_one_digest_per_recipient(self):
+        from django.core import mail
+        from .tasks import generate_monthly_financial_summary
+
+        User.objects.create_user(username='admin1', email='admin1@ornek.com', password='x', is_staff=True)
+        User.objects.create_user(username='admin2', email='admin2@ornek.com', password='x', is_staff=True)
+        Company.objects.create(title='Örnek A.Ş.', tax_number='1234567890', email='info@ornek.com')
+        Company.objects.create(title='Deneme Ltd.', tax_number='0987654321', email='info@deneme.com')
+
+        generate_monthly_financial_summary()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            sorted(message.to for message in mail.outbox),
+            [['admin1@ornek.com'], ['admin2@ornek.com']],
+        )
+        for message in mail.outbox:
+            self.assertIn('Örnek A.Ş.', message.body)
+            self.assertIn('Deneme Ltd.', message.body)
+
+
+class PromissoryNoteOverdueTestCase(TestCase):
+    """Durumu overdue'ya taşınan senet is_overdue olarak görünmeli"""
+
+    def test_transitioned_note_is_overdue(self):
+        from .tasks import update_promissory_note_statuses
+
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        note = PromissoryNote.objects.create(
+            title='Senet', note_number='S-001', amount=Decimal('1000'), due_date=date(2024, 1, 31)
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        self.assertTrue(client.get(f'/api/promissory-notes/{note.pk}/').data['is_overdue'])
+
+        update_promissory_note_statuses()
+        note.refresh_from_db()
+        self.assertEqual(note.payment_status, 'overdue')
+
+        self.assertTrue(client.get(f'/api/promissory-notes/{note.pk}/').data['is_overdue'])
+        self.assertTrue(client.get('/api/promissory-notes/').data['results'][0]['is_overdue'])
+
+
+class ReportPeriodStatisticsTestCase(TestCase):
+    """Dönem raporları başlangıçtan itibaren tüm kayıtları (ileri tarihliler dahil) saymalı"""
+
+    def test_future_dated_records(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .tasks import collect_report_data
+
+        today = timezone.now().date()
+        company = Company.objects.create(title='Örnek A.Ş.', tax_number='1234567890', email='info@ornek.com')
+        for days, amount in ((-3, '100'), (0, '200'), (10, '400')):
+            FinancialRecord.objects.create(
+                title='Satış', type='income', amount=Decimal(amount), date=today + timedelta(days=days),
+                related_company=company
+            )
+
+        weekly = collect_report_data('company', company, 'weekly')
+        self.assertEqual(weekly['statistics']['total_records'], 3)
+        self.assertEqual(weekly['statistics']['total_income'], Decimal('700'))
+        self.assertEqual(len(list(weekly['records'])), 3)
+
+        daily = collect_report_data('company', company, 'daily')
+        self.assertEqual(daily['statistics']['total_records'], 1)
+        self.assertEqual(daily['statistics']['total_income'], Decimal('200'))
+
+
+class BrotliPaddingTestCase(TestCase):
+    """brotli çıktısına eklenen dolgu içeriği bozmamalı, uzunluğu değiştirmeli"""
+
+    def test_padding(self):
+        from .middleware import brotli, compress_brotli
+
+        if brotli is None:
+            self.skipTest('brotli kurulu değil')
+        content = b'{"results": [' + b'{"title": "\xc3\x96rnek A.\xc5\x9e."}, ' * 200 + b'{}]}'
+        outputs = [compress_brotli(content, 4, 100) for _ in range(20)]
+
+        for output in outputs:
+            self.assertEqual(brotli.decompress(output), content)
+        self.assertGreater(len({len(output) for output in outputs}), 1)
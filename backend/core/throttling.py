@@ -0,0 +1,140 @@
+"""
+Redis tabanlı istek sınırlama
+
+DRF'in SimpleRateThrottle'ı geçmişi önbellekten okuyup geri yazar; bu
+okuma-yazma atomik olmadığından eşzamanlı isteklerde sınır aşılabilir.
+Buradaki sınıflar aynı kayan pencere (sliding window) mantığını tek bir Lua
+betiğiyle Redis'te atomik olarak uygular: pencere dışındaki kayıtlar
+silinir, sayı sınırın altındaysa istek eklenir. Zaman Redis'ten alınır,
+böylece tüm worker ve sunucular aynı saati kullanır.
+
+CACHE_REDIS_URL tanımlı değilse DRF'in önbellek tabanlı davranışına
+dönülür. Redis'e ulaşılamazsa istek sınırlanmadan geçirilir (fail open) ve
+uyarı loglanır; sınırlamadaki bir kesinti API'yi durdurmaz.
+"""
+
+import logging
+import uuid
+
+from django.conf import settings
+from redis.exceptions import RedisError
+from rest_framework.throttling import (
+    AnonRateThrottle, ScopedRateThrottle, SimpleRateThrottle, UserRateThrottle
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# KEYS[1]: sayaç anahtarı; ARGV: süre (sn), izin verilen istek sayısı, üye adı
+# Dönüş: {1, 0} izin verildi / {0, beklenecek milisaniye} reddedildi
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1]) * 1000
+local limit = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, tonumber(oldest[2]) + window - now}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, 0}
+"""
+
+_script = None
+
+
+def get_throttle_script():
+    """Süreç başına tek Redis bağlantı havuzu ve kayıtlı betik"""
+    global _script
+    if _script is None and settings.CACHE_REDIS_URL:
+        import redis
+        client = redis.Redis.from_url(
+            settings.CACHE_REDIS_URL,
+            socket_connect_timeout=settings.CACHE_REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.CACHE_REDIS_SOCKET_TIMEOUT,
+        )
+        _script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return _script
+
+
+class RedisRateThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle'ın Redis'te atomik çalışan karşılığı"""
+
+    wait_seconds = None
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        script = get_throttle_script()
+        if script is None:
+            return super().allow_request(request, view)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            allowed, wait_ms = script(
+                keys=[f'{settings.CACHE_KEY_PREFIX}:{self.key}'],
+                args=[self.duration, self.num_requests, uuid.uuid4().hex],
+            )
+        except RedisError as exc:
+            logger.warning("İstek sınırı kontrol edilemedi, istek sınırlanmadan geçiriliyor: %s", exc)
+            return True
+        if allowed:
+            return True
+        self.wait_seconds = max(wait_ms, 0) / 1000
+        return False
+
+    def wait(self):
+        if self.wait_seconds is not None:
+            return self.wait_seconds
+        return super().wait()
+
+
+class RedisAnonRateThrottle(AnonRateThrottle, RedisRateThrottle):
+    pass
+
+
+class RedisUserRateThrottle(UserRateThrottle, RedisRateThrottle):
+    pass
+
+
+def throttle_scope(scope):
+    """
+    Action'a endpoint bazında sınır ata (RedisScopedRateThrottle)
+
+        @action(detail=False, methods=['get'])
+        @throttle_scope('export')
+        def export(self, request): ...
+    """
+    def decorator(func):
+        func.throttle_scope = scope
+        return func
+    return decorator
+
+
+class RedisScopedRateThrottle(ScopedRateThrottle, RedisRateThrottle):
+    """
+    Ağır işlemler için endpoint bazında sınır: action throttle_scope ile
+    işaretlenmişse (veya view'da throttle_scope tanımlıysa) uygulanır
+    """
+
+    def get_scope(self, view):
+        action = getattr(view, 'action', None)
+        handler = getattr(view, action, None) if action else None
+        return getattr(handler, self.scope_attr, None) or getattr(view, self.scope_attr, None)
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(view)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return RedisRateThrottle.allow_request(self, request, view)
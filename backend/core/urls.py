@@ -4,7 +4,7 @@ from .views import (
     CompanyViewSet, BrandViewSet, BranchViewSet, PersonViewSet,
     RoleViewSet, ReportViewSet, ContractViewSet,
     PromissoryNoteViewSet, FinancialRecordViewSet,
-    AuditLogViewSet, DashboardViewSet
+    AuditLogViewSet, DashboardViewSet, TaskStatusViewSet
 )
 
 router = DefaultRouter()
@@ -19,6 +19,7 @@ router.register(r'promissory-notes', PromissoryNoteViewSet, basename='promissory
 router.register(r'financial-records', FinancialRecordViewSet, basename='financial-record')
 router.register(r'audit-logs', AuditLogViewSet, basename='audit-log')
 router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'tasks', TaskStatusViewSet, basename='task')
 
 urlpatterns = [
     path('', include(router.urls)),
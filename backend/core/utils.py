@@ -5,13 +5,6 @@ from django.conf import settings
 from django.core.files.base import ContentFile
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from io import BytesIO
 import pandas as pd
 
@@ -75,59 +68,14 @@ def export_companies_to_excel(queryset):
 
 def export_companies_to_pdf(queryset):
     """Şirketleri PDF'e export et"""
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
+    from django.db.models import Count
+    from .pdf_reports import save_report_pdf
     
-    filename = generate_unique_filename('sirketler', 'pdf')
-    filepath = os.path.join(settings.MEDIA_ROOT, 'exports', filename)
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    doc = SimpleDocTemplate(filepath, pagesize=landscape(A4))
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=20,
-        textColor=colors.HexColor('#366092'),
-        spaceAfter=20
-    )
-    elements.append(Paragraph("Şirketler Listesi", title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Table
-    data = [['Şirket', 'Vergi No', 'E-posta', 'Marka Sayısı', 'Durum']]
-    for company in queryset[:100]:
-        data.append([
-            company.title[:30],
-            company.tax_number,
-            company.email[:25],
-            str(company.brand_count if hasattr(company, 'brand_count') else company.brands.count()),
-            'Aktif' if company.is_active else 'Pasif',
-        ])
-    
-    table = Table(data, colWidths=[6*cm, 3*cm, 5*cm, 2.5*cm, 2*cm])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
-    
-    elements.append(table)
-    doc.build(elements)
+    if 'brand_count' not in queryset.query.annotations:
+        queryset = queryset.annotate(brand_count=Count('brands', distinct=True))
     
-    return f"{settings.MEDIA_URL}exports/{filename}"
+    rows = queryset.values_list('title', 'tax_number', 'email', 'brand_count', 'is_active')
+    return save_report_pdf('sirketler', 'reports/companies.html', {}, rows)
 
 
 
@@ -184,55 +132,18 @@ def export_reports_to_excel(queryset):
 
 def export_reports_to_pdf(queryset):
     """Raporları PDF'e export et"""
-    filename = generate_unique_filename('raporlar', 'pdf')
-    filepath = os.path.join(settings.MEDIA_ROOT, 'exports', filename)
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    doc = SimpleDocTemplate(filepath, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#366092'),
-        alignment=TA_CENTER,
-        spaceAfter=30
-    )
-    elements.append(Paragraph("Raporlar", title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Table data
-    data = [['Başlık', 'Tür', 'Kapsam', 'Tarih']]
-    for report in queryset[:50]:  # İlk 50 rapor
-        data.append([
-            report.title[:40],
-            report.get_report_type_display(),
-            report.get_scope_display(),
-            report.report_date.strftime('%Y-%m-%d'),
-        ])
-    
-    # Create table
-    table = Table(data, colWidths=[3*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
-    
-    elements.append(table)
-    doc.build(elements)
-    
-    return f"{settings.MEDIA_URL}exports/{filename}"
+    from .models import Report
+    from .pdf_reports import save_report_pdf
+    
+    report_types = dict(Report.REPORT_TYPE_CHOICES)
+    scopes = dict(Report.SCOPE_CHOICES)
+    rows = [
+        (title, str(report_types.get(report_type, report_type)), str(scopes.get(scope, scope)), report_date)
+        for title, report_type, scope, report_date in queryset.values_list(
+            'title', 'report_type', 'scope', 'report_date'
+        )
+    ]
+    return save_report_pdf('raporlar', 'reports/reports.html', {}, rows)
 
 
 def export_financial_records_to_excel(queryset):
@@ -293,66 +204,31 @@ def export_financial_records_to_excel(queryset):
 
 def export_financial_records_to_pdf(queryset):
     """Mali kayıtları PDF'e export et"""
-    filename = generate_unique_filename('mali_kayitlar', 'pdf')
-    filepath = os.path.join(settings.MEDIA_ROOT, 'exports', filename)
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    doc = SimpleDocTemplate(filepath, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#2E7D32'),
-        alignment=TA_CENTER,
-        spaceAfter=30
+    from django.db.models import Q
+    from .models import FinancialRecord
+    from .pdf_reports import save_report_pdf
+    
+    # Özet (tek sorgu)
+    totals = queryset.aggregate(
+        total_income=Sum('amount', filter=Q(type='income')),
+        total_expense=Sum('amount', filter=Q(type='expense')),
     )
-    elements.append(Paragraph("Mali Kayıtlar", title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Summary
-    total_income = queryset.filter(type='income').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_expense = queryset.filter(type='expense').aggregate(Sum('amount'))['amount__sum'] or 0
-    
-    summary_style = styles['Normal']
-    elements.append(Paragraph(f"<b>Toplam Gelir:</b> {total_income:,.2f} TL", summary_style))
-    elements.append(Paragraph(f"<b>Toplam Gider:</b> {total_expense:,.2f} TL", summary_style))
-    elements.append(Paragraph(f"<b>Net:</b> {(total_income - total_expense):,.2f} TL", summary_style))
-    elements.append(Spacer(1, 20))
-    
-    # Table data
-    data = [['Başlık', 'Tür', 'Tutar', 'Tarih']]
-    for record in queryset[:50]:  # İlk 50 kayıt
-        data.append([
-            record.title[:30],
-            record.get_type_display(),
-            f"{record.amount:,.2f} {record.currency}",
-            record.date.strftime('%Y-%m-%d'),
-        ])
-    
-    # Create table
-    table = Table(data, colWidths=[3*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (2, 1), (2, -1), 'RIGHT'),  # Amount column right-aligned
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
-    
-    elements.append(table)
-    doc.build(elements)
+    total_income = totals['total_income'] or 0
+    total_expense = totals['total_expense'] or 0
+    context = {
+        'total_income': f"{total_income:,.2f}",
+        'total_expense': f"{total_expense:,.2f}",
+        'net': f"{(total_income - total_expense):,.2f}",
+    }
     
-    return f"{settings.MEDIA_URL}exports/{filename}"
+    types = dict(FinancialRecord.TYPE_CHOICES)
+    rows = [
+        (title, str(types.get(record_type, record_type)), f"{amount:,.2f} {currency}", date)
+        for title, record_type, amount, currency, date in queryset.values_list(
+            'title', 'type', 'amount', 'currency', 'date'
+        )
+    ]
+    return save_report_pdf('mali_kayitlar', 'reports/financial_records.html', context, rows)
 
 
 def import_financial_records_from_excel(file_path, user):
@@ -410,39 +286,26 @@ def import_financial_records_from_excel(file_path, user):
 
 
 def generate_contract_from_template(template_name, context_data):
-    """Şablondan sözleşme oluştur"""
+    """
+    Şablondan sözleşme oluştur
+    Şablon worker başına bir kez derlenir (bkz. core/contract_templates.py)
+    """
     from docx import Document
-    from docx.shared import Pt, RGBColor
+    from .contract_templates import get_compiled_template
     
     # Template path
     template_path = os.path.join(settings.BASE_DIR, 'templates', 'contracts', f'{template_name}.docx')
     
-    if not os.path.exists(template_path):
-        # Basit bir şablon oluştur
-        doc = Document()
-        doc.add_heading('Sözleşme', 0)
-        doc.add_paragraph(f"Sözleşme No: {context_data.get('contract_number', 'N/A')}")
-        doc.add_paragraph(f"Taraflar: {context_data.get('parties', 'N/A')}")
-        doc.add_paragraph(f"Başlangıç Tarihi: {context_data.get('start_date', 'N/A')}")
-        doc.add_paragraph(f"Bitiş Tarihi: {context_data.get('end_date', 'N/A')}")
-    else:
-        doc = Document(template_path)
-        
-        # Replace placeholders
-        for paragraph in doc.paragraphs:
-            for key, value in context_data.items():
-                placeholder = f"{{{{{key}}}}}"
-                if placeholder in paragraph.text:
-                    paragraph.text = paragraph.text.replace(placeholder, str(value))
-        
-        # Replace in tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for key, value in context_data.items():
-                        placeholder = f"{{{{{key}}}}}"
-                        if placeholder in cell.text:
-                            cell.text = cell.text.replace(placeholder, str(value))
+    if os.path.exists(template_path) and os.path.getsize(template_path):
+        return get_compiled_template(template_path).render(context_data)
+    
+    # Basit bir şablon oluştur
+    doc = Document()
+    doc.add_heading('Sözleşme', 0)
+    doc.add_paragraph(f"Sözleşme No: {context_data.get('contract_number', 'N/A')}")
+    doc.add_paragraph(f"Taraflar: {context_data.get('parties', 'N/A')}")
+    doc.add_paragraph(f"Başlangıç Tarihi: {context_data.get('start_date', 'N/A')}")
+    doc.add_paragraph(f"Bitiş Tarihi: {context_data.get('end_date', 'N/A')}")
     
     # Save to BytesIO
     buffer = BytesIO()
@@ -2,14 +2,15 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q, Sum, Prefetch
+from django.db.models import Count, Max, Q, Sum, Prefetch
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from .models import (
     Company, Brand, Branch, Person, Role, Report,
-    Contract, PromissoryNote, FinancialRecord, AuditLog
+    Contract, PromissoryNote, FinancialRecord, AuditLog, MonthlyFinancialSummary
 )
 from .serializers import (
     CompanyListSerializer, CompanyDetailSerializer, CompanyCreateSerializer,
@@ -17,23 +18,68 @@ from .serializers import (
     BranchListSerializer, BranchDetailSerializer, BranchCreateSerializer,
     PersonListSerializer, PersonDetailSerializer, PersonCreateSerializer,
     RoleSerializer, ReportListSerializer, ReportDetailSerializer,
-    ContractListSerializer, ContractDetailSerializer,
+    ContractListSerializer, ContractDetailSerializer, ContractBatchGenerateSerializer,
     PromissoryNoteListSerializer, PromissoryNoteDetailSerializer,
     FinancialRecordListSerializer, FinancialRecordDetailSerializer,
-    AuditLogSerializer, DashboardStatsSerializer
+    AuditLogSerializer, DashboardStatsSerializer, MonthlyFinancialSummarySerializer
 )
 from .permissions import IsOwnerOrReadOnly, CanManageCompany
+from .renderers import EventStreamRenderer
+from .throttling import throttle_scope
+from .progress import EventStreamTokenAuthentication
+from .lifecycle import overdue_notes_condition
+from .list_cache import CachedListMixin
+from .conditional import ConditionalGetMixin
+from .fast_serialization import ValuesListMixin
+from .sparse_fields import SparseFieldsViewSetMixin, related_count
 from .filters import (
     CompanyFilter, BrandFilter, BranchFilter, PersonFilter,
     ReportFilter, ContractFilter, PromissoryNoteFilter, FinancialRecordFilter
 )
 
 
+# ============================================
+# PDF EXPORT
+# ============================================
+
+def pdf_export_response(request, export_name, queryset):
+    """
+    PDF export yanıtı: küçük sonuçlar istek içinde üretilir, büyükleri
+    Celery'ye devredilir (202 + task_id), PDF_REPORT_MAX_ROWS üstü reddedilir
+    """
+    from django.conf import settings
+    from .pdf_reports import export_ordering, get_pdf_exports
+    from .progress import grant_task_access
+    from .tasks import export_pdf_task
+    
+    count = queryset.count()
+    if count > settings.PDF_REPORT_MAX_ROWS:
+        return Response(
+            {'error': f'PDF en fazla {settings.PDF_REPORT_MAX_ROWS} kayıt içerebilir, filtreleri daraltın'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if count <= settings.PDF_REPORT_SYNC_MAX_ROWS:
+        _, export = get_pdf_exports()[export_name]
+        return Response({'download_url': export(queryset), 'format': 'pdf'})
+    
+    ids = [str(pk) for pk in queryset.values_list('pk', flat=True)]
+    task = export_pdf_task.delay(export_name, ids, export_ordering(queryset))
+    grant_task_access(task.id, request.user)
+    
+    return Response({
+        'task_id': task.id,
+        'status': 'processing',
+        'format': 'pdf',
+        'message': 'PDF oluşturuluyor...'
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 # ============================================
 # COMPANY VIEWSET
 # ============================================
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Şirket ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -41,6 +87,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'tax_number', 'email']
     ordering_fields = ['title', 'created_at', 'tax_number']
     ordering = ['-created_at']
+    list_cache_models = (Company, Brand, Branch, Person)
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -105,6 +152,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
         return Response({'is_active': company.is_active})
 
     @action(detail=False, methods=['post'])
+    @throttle_scope('bulk_delete')
     def bulk_delete(self, request):
         """Toplu silme"""
         ids = request.data.get('ids', [])
@@ -115,9 +163,10 @@ class CompanyViewSet(viewsets.ModelViewSet):
         return Response({'deleted_count': deleted_count})
 
     @action(detail=False, methods=['get'])
+    @throttle_scope('export')
     def export(self, request):
         """Export (Excel/PDF)"""
-        from .utils import export_companies_to_excel, export_companies_to_pdf
+        from .utils import export_companies_to_excel
         
         export_format = request.query_params.get('format', 'excel')
         queryset = self.filter_queryset(self.get_queryset())
@@ -126,8 +175,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
             file_url = export_companies_to_excel(queryset)
             return Response({'download_url': file_url, 'format': 'excel'})
         elif export_format == 'pdf':
-            file_url = export_companies_to_pdf(queryset)
-            return Response({'download_url': file_url, 'format': 'pdf'})
+            return pdf_export_response(request, 'companies', queryset)
         
         return Response({'error': 'Geçersiz format'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -136,7 +184,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
 # BRAND VIEWSET
 # ============================================
 
-class BrandViewSet(viewsets.ModelViewSet):
+class BrandViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Marka ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -144,6 +192,8 @@ class BrandViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'email', 'phone', 'company__title']
     ordering_fields = ['name', 'created_at', 'branch_count']
     ordering = ['name']
+    list_cache_models = (Brand, Company, Branch)
+    conditional_models = (Brand, Company, Branch, Person)
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -175,6 +225,7 @@ class BrandViewSet(viewsets.ModelViewSet):
         return Response(stats)
 
     @action(detail=False, methods=['post'])
+    @throttle_scope('bulk_delete')
     def bulk_delete(self, request):
         """Toplu silme"""
         ids = request.data.get('ids', [])
@@ -189,7 +240,7 @@ class BrandViewSet(viewsets.ModelViewSet):
 # BRANCH VIEWSET
 # ============================================
 
-class BranchViewSet(viewsets.ModelViewSet):
+class BranchViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Şube ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -197,6 +248,7 @@ class BranchViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'address', 'phone', 'email', 'sgk_number']
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
+    list_cache_models = (Branch, Brand, Company, Person, Role)
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -245,6 +297,7 @@ class BranchViewSet(viewsets.ModelViewSet):
         return Response(stats)
 
     @action(detail=False, methods=['post'])
+    @throttle_scope('bulk_delete')
     def bulk_delete(self, request):
         """Toplu silme"""
         ids = request.data.get('ids', [])
@@ -259,7 +312,7 @@ class BranchViewSet(viewsets.ModelViewSet):
 # ROLE VIEWSET
 # ============================================
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     """Rol ViewSet"""
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
@@ -268,13 +321,15 @@ class RoleViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'display_name']
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
+    list_cache_models = (Role, Person)
 
 
 # ============================================
 # PERSON VIEWSET
 # ============================================
 
-class PersonViewSet(viewsets.ModelViewSet):
+class PersonViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, SparseFieldsViewSetMixin,
+                    viewsets.ModelViewSet):
     """Kişi ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -282,6 +337,17 @@ class PersonViewSet(viewsets.ModelViewSet):
     search_fields = ['full_name', 'phone', 'email', 'national_id']
     ordering_fields = ['full_name', 'created_at']
     ordering = ['full_name']
+    list_cache_models = (Person, Branch, Brand, Company, Role)
+    conditional_models = (
+        Person, Branch, Brand, Company, Role,
+        Contract, PromissoryNote, FinancialRecord,
+    )
+    # Detay sayıları yalnızca istendiğinde, alt sorgu olarak eklenir
+    sparse_annotations = {
+        'contracts_count': lambda: related_count(Contract, 'related_person'),
+        'promissory_notes_count': lambda: related_count(PromissoryNote, 'related_person'),
+        'financial_records_count': lambda: related_count(FinancialRecord, 'related_person'),
+    }
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -328,6 +394,7 @@ class PersonViewSet(viewsets.ModelViewSet):
         return Response({'is_active': person.is_active})
 
     @action(detail=False, methods=['post'])
+    @throttle_scope('bulk_delete')
     def bulk_delete(self, request):
         """Toplu silme"""
         ids = request.data.get('ids', [])
@@ -342,7 +409,7 @@ class PersonViewSet(viewsets.ModelViewSet):
 # REPORT VIEWSET
 # ============================================
 
-class ReportViewSet(viewsets.ModelViewSet):
+class ReportViewSet(ValuesListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     """Rapor ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -362,32 +429,87 @@ class ReportViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=False, methods=['post'])
+    @throttle_scope('report_generate')
     def generate(self, request):
-        """Rapor oluştur (heavy operation - Celery ile)"""
+        """
+        Rapor oluştur (heavy operation - Celery ile)
+        Aynı scope/entity/tür/dönem ve değişmemiş veri için mevcut rapor
+        döndürülür; üretimi süren bir istek varsa onun task_id'si paylaşılır.
+        """
+        import uuid
+        from django.core.cache import cache
         from .tasks import generate_report_task
+        from .progress import grant_task_access
+        from .reporting import (
+            SCOPES, REPORT_TASK_LOCK_TIMEOUT,
+            report_generation_key, report_task_cache_key
+        )
         
         scope = request.data.get('scope')
         report_type = request.data.get('report_type')
         entity_id = request.data.get('entity_id')
         
-        # Celery task başlat
-        task = generate_report_task.delay(
-            user_id=request.user.id,
+        try:
+            entity_id = str(uuid.UUID(str(entity_id)))
+        except ValueError:
+            entity_id = None
+        if scope not in SCOPES or report_type not in dict(Report.REPORT_TYPE_CHOICES) or not entity_id:
+            return Response(
+                {'error': 'scope, report_type ve entity_id gerekli'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        generation_key = report_generation_key(scope, entity_id, report_type)
+        
+        # Veri değişmediyse tamamlanmış raporu döndür
+        existing = Report.objects.filter(
             scope=scope,
             report_type=report_type,
-            entity_id=entity_id
+            metadata__generation_key=generation_key
+        ).select_related('created_by', 'company', 'brand', 'branch', 'person').first()
+        if existing:
+            return Response({
+                'status': 'completed',
+                'report': ReportDetailSerializer(existing, context={'request': request}).data,
+                'message': 'Rapor zaten güncel'
+            })
+        
+        # Aynı anahtar için süren üretimi paylaş
+        task_id = str(uuid.uuid4())
+        cache_key = report_task_cache_key(generation_key)
+        if not cache.add(cache_key, task_id, timeout=REPORT_TASK_LOCK_TIMEOUT):
+            task_id = cache.get(cache_key, task_id)
+            grant_task_access(task_id, request.user)
+            return Response({
+                'task_id': task_id,
+                'status': 'processing',
+                'message': 'Rapor oluşturuluyor...'
+            }, status=status.HTTP_202_ACCEPTED)
+        
+        # Celery task başlat
+        generate_report_task.apply_async(
+            kwargs={
+                'user_id': request.user.id,
+                'scope': scope,
+                'report_type': report_type,
+                'entity_id': entity_id,
+                'generation_key': generation_key,
+            },
+            task_id=task_id
         )
+        grant_task_access(task_id, request.user)
         
         return Response({
-            'task_id': task.id,
+            'task_id': task_id,
             'status': 'processing',
             'message': 'Rapor oluşturuluyor...'
         }, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=False, methods=['get'])
+    @throttle_scope('export')
     def export(self, request):
         """Raporları export et (Excel/PDF)"""
-        from .utils import export_reports_to_excel, export_reports_to_pdf
+        from .utils import export_reports_to_excel
         
         export_format = request.query_params.get('format', 'excel')
         queryset = self.filter_queryset(self.get_queryset())
@@ -396,8 +518,7 @@ class ReportViewSet(viewsets.ModelViewSet):
             file_path = export_reports_to_excel(queryset)
             return Response({'download_url': file_path, 'format': 'excel'})
         elif export_format == 'pdf':
-            file_path = export_reports_to_pdf(queryset)
-            return Response({'download_url': file_path, 'format': 'pdf'})
+            return pdf_export_response(request, 'reports', queryset)
         
         return Response({'error': 'Geçersiz format'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -406,7 +527,7 @@ class ReportViewSet(viewsets.ModelViewSet):
 # CONTRACT VIEWSET
 # ============================================
 
-class ContractViewSet(viewsets.ModelViewSet):
+class ContractViewSet(ValuesListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     """Sözleşme ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -426,12 +547,15 @@ class ContractViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=True, methods=['post'])
+    @throttle_scope('document_generate')
     def generate_pdf(self, request, pk=None):
         """Sözleşmeden PDF oluştur"""
         contract = self.get_object()
         from .tasks import generate_contract_pdf_task
+        from .progress import grant_task_access
         
         task = generate_contract_pdf_task.delay(str(contract.id))
+        grant_task_access(task.id, request.user)
         
         return Response({
             'task_id': task.id,
@@ -439,6 +563,38 @@ class ContractViewSet(viewsets.ModelViewSet):
             'message': 'PDF oluşturuluyor...'
         }, status=status.HTTP_202_ACCEPTED)
 
+    @action(detail=False, methods=['post'])
+    @throttle_scope('document_generate')
+    def batch_generate(self, request):
+        """
+        Toplu sözleşme belgesi oluştur (ZIP)
+        Body'de 'ids' verilirse o sözleşmeler, verilmezse query parametrelerindeki
+        filtrelere uyan sözleşmeler işlenir.
+        """
+        from .tasks import generate_contracts_batch_task
+        from .progress import grant_task_access
+        
+        serializer = ContractBatchGenerateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get('ids')
+        queryset = self.filter_queryset(self.get_queryset())
+        if ids:
+            queryset = queryset.filter(id__in=ids)
+        
+        contract_ids = [str(contract_id) for contract_id in queryset.values_list('id', flat=True)]
+        if not contract_ids:
+            return Response({'error': 'Sözleşme bulunamadı'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        task = generate_contracts_batch_task.delay(contract_ids)
+        grant_task_access(task.id, request.user)
+        
+        return Response({
+            'task_id': task.id,
+            'status': 'processing',
+            'count': len(contract_ids),
+            'message': 'Sözleşme belgeleri oluşturuluyor...'
+        }, status=status.HTTP_202_ACCEPTED)
+
     @action(detail=False, methods=['get'])
     def expiring_soon(self, request):
         """Yakında süresini dolacak sözleşmeler"""
@@ -459,7 +615,7 @@ class ContractViewSet(viewsets.ModelViewSet):
 # PROMISSORY NOTE VIEWSET
 # ============================================
 
-class PromissoryNoteViewSet(viewsets.ModelViewSet):
+class PromissoryNoteViewSet(ValuesListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     """Senet ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -489,10 +645,7 @@ class PromissoryNoteViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def overdue(self, request):
         """Vadesi geçmiş senetler"""
-        notes = self.get_queryset().filter(
-            due_date__lt=timezone.now().date(),
-            payment_status='pending'
-        )
+        notes = self.get_queryset().filter(overdue_notes_condition())
         serializer = self.get_serializer(notes, many=True)
         return Response(serializer.data)
 
@@ -505,10 +658,7 @@ class PromissoryNoteViewSet(viewsets.ModelViewSet):
             'total_count': queryset.count(),
             'pending_count': queryset.filter(payment_status='pending').count(),
             'paid_count': queryset.filter(payment_status='paid').count(),
-            'overdue_count': queryset.filter(
-                due_date__lt=timezone.now().date(),
-                payment_status='pending'
-            ).count(),
+            'overdue_count': queryset.filter(overdue_notes_condition()).count(),
             'total_amount': queryset.aggregate(Sum('amount'))['amount__sum'] or 0,
             'pending_amount': queryset.filter(
                 payment_status='pending'
@@ -522,7 +672,7 @@ class PromissoryNoteViewSet(viewsets.ModelViewSet):
 # FINANCIAL RECORD VIEWSET
 # ============================================
 
-class FinancialRecordViewSet(viewsets.ModelViewSet):
+class FinancialRecordViewSet(ValuesListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     """Mali Kayıt ViewSet"""
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -559,9 +709,10 @@ class FinancialRecordViewSet(viewsets.ModelViewSet):
         return Response(summary)
 
     @action(detail=False, methods=['get'])
+    @throttle_scope('export')
     def export(self, request):
         """Mali kayıtları export et"""
-        from .utils import export_financial_records_to_excel, export_financial_records_to_pdf
+        from .utils import export_financial_records_to_excel
         
         export_format = request.query_params.get('format', 'excel')
         queryset = self.filter_queryset(self.get_queryset())
@@ -570,8 +721,7 @@ class FinancialRecordViewSet(viewsets.ModelViewSet):
             file_path = export_financial_records_to_excel(queryset)
             return Response({'download_url': file_path, 'format': 'excel'})
         elif export_format == 'pdf':
-            file_path = export_financial_records_to_pdf(queryset)
-            return Response({'download_url': file_path, 'format': 'pdf'})
+            return pdf_export_response(request, 'financial_records', queryset)
         
         return Response({'error': 'Geçersiz format'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -606,6 +756,67 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['-timestamp']
 
 
+# ============================================
+# TASK STATUS VIEWSET
+# ============================================
+
+class TaskStatusViewSet(viewsets.ViewSet):
+    """
+    Celery task durumları (rapor/PDF üretimi vb.)
+    Yalnızca task'ı başlatan kullanıcı görebilir; diğerleri için 404 döner.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def check_task_access(self, request, pk):
+        from rest_framework.exceptions import NotFound
+        from .progress import has_task_access
+
+        if not has_task_access(pk, request.user):
+            raise NotFound('Task bulunamadı')
+
+    def retrieve(self, request, pk=None):
+        """Anlık task durumu ve ilerleme bilgisi"""
+        from .progress import task_status
+
+        self.check_task_access(request, pk)
+        return Response(task_status(pk))
+
+    @action(detail=True, methods=['post'], url_path='events-token')
+    def events_token(self, request, pk=None):
+        """EventSource için kısa ömürlü events token'ı (?token=)"""
+        from django.conf import settings
+        from .progress import make_event_stream_token
+
+        self.check_task_access(request, pk)
+        return Response({
+            'token': make_event_stream_token(pk, request.user),
+            'expires_in': settings.TASK_EVENTS_TOKEN_MAX_AGE,
+        })
+
+    @action(
+        detail=True, methods=['get'], renderer_classes=[EventStreamRenderer],
+        authentication_classes=[EventStreamTokenAuthentication, JWTAuthentication]
+    )
+    def events(self, request, pk=None):
+        """Task durum değişikliklerini Server-Sent Events ile ilet"""
+        from django.http import StreamingHttpResponse
+        from rest_framework.exceptions import NotFound
+        from .progress import stream_task_events
+
+        # Token yalnızca üretildiği task için geçerli
+        if isinstance(request.auth, dict) and request.auth.get('task') != str(pk):
+            raise NotFound('Task bulunamadı')
+        self.check_task_access(request, pk)
+
+        response = StreamingHttpResponse(
+            stream_task_events(pk),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx tamponlamasını kapat
+        return response
+
+
 # ============================================
 # DASHBOARD VIEWSET
 # ============================================
@@ -639,16 +850,32 @@ class DashboardViewSet(viewsets.ViewSet):
                 Report.objects.all()[:5], many=True
             ).data,
             'overdue_notes': PromissoryNoteListSerializer(
-                PromissoryNote.objects.filter(
-                    due_date__lt=timezone.now().date(),
-                    payment_status='pending'
-                )[:5], many=True
+                PromissoryNote.objects.filter(overdue_notes_condition())[:5], many=True
             ).data,
         }
         
         serializer = DashboardStatsSerializer(stats)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def financial_summary(self, request):
+        """Aylık mali özetler (?period=YYYY-MM, varsayılan: en son dönem)"""
+        summaries = MonthlyFinancialSummary.objects.select_related('company')
+        
+        period = request.query_params.get('period')
+        if period:
+            try:
+                period = datetime.strptime(period, '%Y-%m').date()
+            except ValueError:
+                return Response({'error': 'Geçersiz dönem (YYYY-MM)'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            period = summaries.aggregate(latest=Max('period'))['latest']
+        
+        serializer = MonthlyFinancialSummarySerializer(
+            summaries.filter(period=period).order_by('company__title'), many=True
+        )
+        return Response({'period': period, 'results': serializer.data})
+
     @action(detail=False, methods=['get'])
     def recent_activity(self, request):
         """Son aktiviteler"""